@@ -0,0 +1,42 @@
+"""add status/date composite indexes to pedidos
+
+Revision ID: d5a9e1c7b3f2
+Revises: b8e4d3f2a1c5
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a9e1c7b3f2"
+down_revision: Union[str, Sequence[str], None] = "b8e4d3f2a1c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Os índices estão em Pedido.__table_args__: o create_all do startup pode já tê-los criado
+    op.create_index(
+        "ix_pedidos_status_data_entrada",
+        "pedidos",
+        ["status", "data_entrada"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_pedidos_status_data_entrega",
+        "pedidos",
+        ["status", "data_entrega"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_pedidos_status_data_entrega", table_name="pedidos", if_exists=True)
+    op.drop_index("ix_pedidos_status_data_entrada", table_name="pedidos", if_exists=True)
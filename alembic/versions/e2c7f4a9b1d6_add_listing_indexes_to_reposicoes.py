@@ -0,0 +1,38 @@
+"""add listing indexes to reposicoes
+
+Revision ID: e2c7f4a9b1d6
+Revises: d5a9e1c7b3f2
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2c7f4a9b1d6"
+down_revision: Union[str, Sequence[str], None] = "d5a9e1c7b3f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # reposicoes é criada pelo create_all do startup: os índices podem já existir
+    op.create_index(
+        "ix_reposicoes_order_status_created",
+        "reposicoes",
+        ["order_id", "status", "created_at"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_reposicoes_created_at", "reposicoes", ["created_at"], unique=False, if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_reposicoes_created_at", table_name="reposicoes", if_exists=True)
+    op.drop_index("ix_reposicoes_order_status_created", table_name="reposicoes", if_exists=True)
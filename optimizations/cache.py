@@ -77,6 +77,16 @@ class TTLCache:
         self.cache[key] = value
         self.timestamps[key] = time.time()
     
+    def delete(self, key: str) -> None:
+        """
+        Remove uma única chave do cache, se existir.
+        
+        Args:
+            key: Chave do cache
+        """
+        if self.cache.pop(key, None) is not None:
+            del self.timestamps[key]
+    
     def invalidate(self, pattern: Optional[str] = None) -> None:
         """
         Invalida cache (remove itens).
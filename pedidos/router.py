@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, List, Optional
+from typing import Any, AsyncIterator, List, Optional
 import logging
 import asyncio
 
@@ -1014,6 +1014,162 @@ def _validate_iso_date(value: Optional[str], field_name: str) -> Optional[str]:
         raise HTTPException(status_code=400, detail=f"{field_name} inválida: {value}. Use o formato YYYY-MM-DD.")
 
 
+def _validate_date_range(
+    data_inicio: Optional[str], data_fim: Optional[str]
+) -> tuple[Optional[str], Optional[str]]:
+    data_inicio = _validate_iso_date(data_inicio, "data_inicio")
+    data_fim = _validate_iso_date(data_fim, "data_fim")
+
+    if data_inicio and data_fim and data_inicio > data_fim:
+        raise HTTPException(status_code=400, detail="data_inicio deve ser menor ou igual a data_fim")
+    return data_inicio, data_fim
+
+
+def _build_listar_pedidos_query(
+    *,
+    skip: int,
+    limit: Optional[int],
+    status: Optional[Status],
+    cliente: Optional[str],
+    data_inicio: Optional[str],
+    data_fim: Optional[str],
+    date_mode: str,
+    is_pronto: Optional[bool],
+    current_user: Optional[User],
+):
+    """
+    Monta o SELECT de listagem de pedidos (filtros, ordenação e paginação).
+    As datas já devem ter passado por `_validate_date_range`.
+    """
+    filters = select(Pedido)
+    if status:
+        filters = filters.where(Pedido.status == status)
+
+    if is_pronto is not None:
+        filters = filters.where(Pedido.pronto == is_pronto)
+
+    if cliente:
+        # Normalizar cliente para busca (remover acentos e caracteres especiais)
+        import unicodedata
+        cliente_normalized = unicodedata.normalize('NFKD', cliente.strip().lower())
+        cliente_normalized = ''.join(c for c in cliente_normalized if not unicodedata.combining(c))
+        search = f"%{cliente_normalized}%"
+
+        # Usar função REPLACE do SQLite para normalizar também a coluna cliente
+        # Substituir caracteres acentuados comuns: Ç->c, Á->a, É->e, Í->i, Ó->o, Ú->u, Ã->a, Õ->o
+        cliente_col_normalized = func.lower(Pedido.cliente)
+        cliente_col_normalized = func.replace(cliente_col_normalized, 'ç', 'c')
+        cliente_col_normalized = func.replace(cliente_col_normalized, 'á', 'a')
+        cliente_col_normalized = func.replace(cliente_col_normalized, 'à', 'a')
+        cliente_col_normalized = func.replace(cliente_col_normalized, 'ã', 'a')
+        cliente_col_normalized = func.replace(cliente_col_normalized, 'â', 'a')
+        cliente_col_normalized = func.replace(cliente_col_normalized, 'é', 'e')
+        cliente_col_normalized = func.replace(cliente_col_normalized, 'ê', 'e')
+        cliente_col_normalized = func.replace(cliente_col_normalized, 'í', 'i')
+        cliente_col_normalized = func.replace(cliente_col_normalized, 'ó', 'o')
+        cliente_col_normalized = func.replace(cliente_col_normalized, 'ô', 'o')
+        cliente_col_normalized = func.replace(cliente_col_normalized, 'õ', 'o')
+        cliente_col_normalized = func.replace(cliente_col_normalized, 'ú', 'u')
+
+        filters = filters.where(cliente_col_normalized.like(search))
+        logger.info(f"[listar_pedidos] Filtro cliente aplicado (normalizado): {search}")
+
+    # Aplicar filtro de data conforme date_mode
+    if data_inicio or data_fim:
+        date_mode_normalized = (date_mode or "entrega").lower().strip()
+
+        if date_mode_normalized == "entrada":
+            if data_inicio:
+                filters = filters.where(Pedido.data_entrada >= data_inicio)
+            if data_fim:
+                next_day = (datetime.strptime(data_fim, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+                filters = filters.where(Pedido.data_entrada < next_day)
+
+        elif date_mode_normalized == "qualquer":
+            if data_inicio and data_fim:
+                next_day = (datetime.strptime(data_fim, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+                filters = filters.where(
+                    or_(
+                        and_(Pedido.data_entrada >= data_inicio, Pedido.data_entrada < next_day),
+                        and_(Pedido.data_entrega >= data_inicio, Pedido.data_entrega < next_day)
+                    )
+                )
+            elif data_inicio:
+                filters = filters.where(
+                    or_(Pedido.data_entrada >= data_inicio, Pedido.data_entrega >= data_inicio)
+                )
+            elif data_fim:
+                next_day = (datetime.strptime(data_fim, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+                filters = filters.where(
+                    or_(Pedido.data_entrada < next_day, Pedido.data_entrega < next_day)
+                )
+
+        else:
+            # Padrão: filtrar por data_entrega
+            if data_inicio:
+                filters = filters.where(Pedido.data_entrega >= data_inicio)
+            if data_fim:
+                next_day = (datetime.strptime(data_fim, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+                filters = filters.where(Pedido.data_entrega < next_day)
+
+    # Aplicar ordenação baseada no perfil do usuário
+    if current_user:
+        if current_user.is_admin:
+            # Admin: Financeiro pendente primeiro -> Prioridade Alta -> ID decrescente
+            filters = filters.order_by(
+                Pedido.financeiro.asc(),
+                case((Pedido.prioridade == 'ALTA', 0), else_=1).asc(),
+                Pedido.id.desc()
+            )
+        elif current_user.setor == 'impressao':
+            # Impressão: Sublimação pendente primeiro -> Prioridade Alta -> ID decrescente
+            filters = filters.order_by(
+                Pedido.sublimacao.asc(),
+                case((Pedido.prioridade == 'ALTA', 0), else_=1).asc(),
+                Pedido.id.desc()
+            )
+        else:
+            filters = filters.order_by(Pedido.data_criacao.desc())
+    else:
+        filters = filters.order_by(Pedido.data_criacao.desc())
+
+    filters = filters.offset(skip)
+    if limit is not None:
+        filters = filters.limit(limit)
+
+    return filters
+
+
+async def _build_pedido_responses(
+    session: AsyncSession, pedidos: List[Pedido]
+) -> List[PedidoResponse]:
+    """Converte pedidos carregados do banco em PedidoResponse (items + imagens)."""
+    # Converter items de JSON string para objetos (otimizado: batch)
+    pedidos_items: dict[int, List[ItemPedido]] = {}
+    for pedido in pedidos:
+        if pedido.id is not None:
+            items = json_string_to_items(pedido.items)
+            pedidos_items[pedido.id] = items
+
+    # Buscar todas as imagens de uma vez (evita N+1 queries)
+    await populate_items_with_image_paths_batch(session, pedidos, pedidos_items)
+
+    # Montar resposta - criar PedidoResponse diretamente do objeto
+    response_pedidos = []
+    for pedido in pedidos:
+        try:
+            items = pedidos_items.get(pedido.id, []) if pedido.id is not None else []
+            pedido_data = pedido_to_response_dict(pedido, items)
+            response_pedido = PedidoResponse(**pedido_data)
+            response_pedidos.append(response_pedido)
+        except Exception as e:
+            logger.error(f"Erro ao processar pedido {pedido.id if hasattr(pedido, 'id') and pedido.id else 'unknown'}: {e}", exc_info=True)
+            # Continuar com próximo pedido
+            continue
+
+    return response_pedidos
+
+
 @router.get("/", response_model=List[PedidoResponse])
 async def listar_pedidos(
     session: AsyncSession = Depends(get_session),
@@ -1037,107 +1193,18 @@ async def listar_pedidos(
       * 'qualquer': Filtra por qualquer uma das duas datas (data_entrada OU data_entrega)
     """
     try:
-        filters = select(Pedido)
-        if status:
-            filters = filters.where(Pedido.status == status)
-
-        if is_pronto is not None:
-            filters = filters.where(Pedido.pronto == is_pronto)
-
-        if cliente:
-            # Normalizar cliente para busca (remover acentos e caracteres especiais)
-            import unicodedata
-            cliente_normalized = unicodedata.normalize('NFKD', cliente.strip().lower())
-            cliente_normalized = ''.join(c for c in cliente_normalized if not unicodedata.combining(c))
-            search = f"%{cliente_normalized}%"
-            
-            # Usar função REPLACE do SQLite para normalizar também a coluna cliente
-            # Substituir caracteres acentuados comuns: Ç->c, Á->a, É->e, Í->i, Ó->o, Ú->u, Ã->a, Õ->o
-            cliente_col_normalized = func.lower(Pedido.cliente)
-            cliente_col_normalized = func.replace(cliente_col_normalized, 'ç', 'c')
-            cliente_col_normalized = func.replace(cliente_col_normalized, 'á', 'a')
-            cliente_col_normalized = func.replace(cliente_col_normalized, 'à', 'a')
-            cliente_col_normalized = func.replace(cliente_col_normalized, 'ã', 'a')
-            cliente_col_normalized = func.replace(cliente_col_normalized, 'â', 'a')
-            cliente_col_normalized = func.replace(cliente_col_normalized, 'é', 'e')
-            cliente_col_normalized = func.replace(cliente_col_normalized, 'ê', 'e')
-            cliente_col_normalized = func.replace(cliente_col_normalized, 'í', 'i')
-            cliente_col_normalized = func.replace(cliente_col_normalized, 'ó', 'o')
-            cliente_col_normalized = func.replace(cliente_col_normalized, 'ô', 'o')
-            cliente_col_normalized = func.replace(cliente_col_normalized, 'õ', 'o')
-            cliente_col_normalized = func.replace(cliente_col_normalized, 'ú', 'u')
-            
-            filters = filters.where(cliente_col_normalized.like(search))
-            logger.info(f"[listar_pedidos] Filtro cliente aplicado (normalizado): {search}")
-
-        data_inicio = _validate_iso_date(data_inicio, "data_inicio")
-        data_fim = _validate_iso_date(data_fim, "data_fim")
-
-        if data_inicio and data_fim and data_inicio > data_fim:
-            raise HTTPException(status_code=400, detail="data_inicio deve ser menor ou igual a data_fim")
-
-        # Aplicar filtro de data conforme date_mode
-        if data_inicio or data_fim:
-            date_mode_normalized = (date_mode or "entrega").lower().strip()
-            
-            if date_mode_normalized == "entrada":
-                if data_inicio:
-                    filters = filters.where(Pedido.data_entrada >= data_inicio)
-                if data_fim:
-                    next_day = (datetime.strptime(data_fim, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
-                    filters = filters.where(Pedido.data_entrada < next_day)
-            
-            elif date_mode_normalized == "qualquer":
-                if data_inicio and data_fim:
-                    next_day = (datetime.strptime(data_fim, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
-                    filters = filters.where(
-                        or_(
-                            and_(Pedido.data_entrada >= data_inicio, Pedido.data_entrada < next_day),
-                            and_(Pedido.data_entrega >= data_inicio, Pedido.data_entrega < next_day)
-                        )
-                    )
-                elif data_inicio:
-                    filters = filters.where(
-                        or_(Pedido.data_entrada >= data_inicio, Pedido.data_entrega >= data_inicio)
-                    )
-                elif data_fim:
-                    next_day = (datetime.strptime(data_fim, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
-                    filters = filters.where(
-                        or_(Pedido.data_entrada < next_day, Pedido.data_entrega < next_day)
-                    )
-            
-            else:
-                # Padrão: filtrar por data_entrega
-                if data_inicio:
-                    filters = filters.where(Pedido.data_entrega >= data_inicio)
-                if data_fim:
-                    next_day = (datetime.strptime(data_fim, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
-                    filters = filters.where(Pedido.data_entrega < next_day)
-        
-        # Aplicar ordenação baseada no perfil do usuário
-        if current_user:
-            if current_user.is_admin:
-                # Admin: Financeiro pendente primeiro -> Prioridade Alta -> ID decrescente
-                filters = filters.order_by(
-                    Pedido.financeiro.asc(),
-                    case((Pedido.prioridade == 'ALTA', 0), else_=1).asc(),
-                    Pedido.id.desc()
-                )
-            elif current_user.setor == 'impressao':
-                # Impressão: Sublimação pendente primeiro -> Prioridade Alta -> ID decrescente
-                filters = filters.order_by(
-                    Pedido.sublimacao.asc(),
-                    case((Pedido.prioridade == 'ALTA', 0), else_=1).asc(),
-                    Pedido.id.desc()
-                )
-            else:
-                filters = filters.order_by(Pedido.data_criacao.desc())
-        else:
-            filters = filters.order_by(Pedido.data_criacao.desc())
-
-        filters = filters.offset(skip)
-        if limit is not None:
-            filters = filters.limit(limit)
+        data_inicio, data_fim = _validate_date_range(data_inicio, data_fim)
+        filters = _build_listar_pedidos_query(
+            skip=skip,
+            limit=limit,
+            status=status,
+            cliente=cliente,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            date_mode=date_mode,
+            is_pronto=is_pronto,
+            current_user=current_user,
+        )
         
         # Log da query para debug
         logger.info(f"[listar_pedidos] Executando query com filtros: skip={skip}, limit={limit}, status={status}, cliente={cliente}, data_inicio={data_inicio}, data_fim={data_fim}, date_mode={date_mode}")
@@ -1381,30 +1448,7 @@ async def listar_pedidos(
                     logger.error(f"Erro ao criar pedido da row: {e}", exc_info=True)
                     continue
         
-        # Converter items de JSON string para objetos (otimizado: batch)
-        pedidos_items: dict[int, List[ItemPedido]] = {}
-        for pedido in pedidos:
-            if pedido.id is not None:
-                items = json_string_to_items(pedido.items)
-                pedidos_items[pedido.id] = items
-        
-        # Buscar todas as imagens de uma vez (evita N+1 queries)
-        await populate_items_with_image_paths_batch(session, pedidos, pedidos_items)
-        
-        # Montar resposta - criar PedidoResponse diretamente do objeto
-        response_pedidos = []
-        for pedido in pedidos:
-            try:
-                items = pedidos_items.get(pedido.id, []) if pedido.id is not None else []
-                pedido_data = pedido_to_response_dict(pedido, items)
-                response_pedido = PedidoResponse(**pedido_data)
-                response_pedidos.append(response_pedido)
-            except Exception as e:
-                logger.error(f"Erro ao processar pedido {pedido.id if hasattr(pedido, 'id') and pedido.id else 'unknown'}: {e}", exc_info=True)
-                # Continuar com próximo pedido
-                continue
-        
-        return response_pedidos
+        return await _build_pedido_responses(session, pedidos)
         
     except HTTPException:
         raise
@@ -1413,6 +1457,47 @@ async def listar_pedidos(
         raise HTTPException(status_code=500, detail="Erro interno ao listar pedidos")
 
 
+async def iter_pedidos(
+    session: AsyncSession,
+    *,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    status: Optional[Status] = None,
+    cliente: Optional[str] = None,
+    data_inicio: Optional[str] = None,
+    data_fim: Optional[str] = None,
+    date_mode: str = "entrada",
+    is_pronto: Optional[bool] = None,
+    current_user: Optional[User] = None,
+    batch_size: int = 500,
+) -> AsyncIterator[PedidoResponse]:
+    """
+    Variante em streaming de `listar_pedidos`.
+
+    Lê os pedidos com `session.stream()` em lotes de `batch_size`, convertendo
+    cada lote em PedidoResponse antes de buscar o próximo. A memória fica
+    limitada ao lote atual em vez do resultado inteiro.
+    As datas devem ser validadas antes com `_validate_date_range`.
+    """
+    statement = _build_listar_pedidos_query(
+        skip=skip,
+        limit=limit,
+        status=status,
+        cliente=cliente,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        date_mode=date_mode,
+        is_pronto=is_pronto,
+        current_user=current_user,
+    )
+    result = await session.stream(statement)
+    async for partition in result.scalars().partitions(batch_size):
+        for pedido in partition:
+            normalize_pedido_status(pedido)
+        for response_pedido in await _build_pedido_responses(session, partition):
+            yield response_pedido
+
+
 @router.get("/total")
 async def contar_total_pedidos(
     session: AsyncSession = Depends(get_session),
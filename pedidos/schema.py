@@ -3,7 +3,7 @@ from typing import List, Optional
 from enum import Enum
 from datetime import datetime
 from pydantic import ConfigDict, field_validator, model_validator
-from sqlalchemy import TypeDecorator, String, Enum as SQLEnum
+from sqlalchemy import Index, TypeDecorator, String, Enum as SQLEnum
 
 class Prioridade(str, Enum):
     NORMAL = "NORMAL"
@@ -310,6 +310,11 @@ class PedidoUpdate(SQLModel):
 
 class Pedido(PedidoBase, table=True):
     __tablename__ = "pedidos"
+    __table_args__ = (
+        # Relatórios de fechamento filtram por status + intervalo de data
+        Index("ix_pedidos_status_data_entrada", "status", "data_entrada"),
+        Index("ix_pedidos_status_data_entrega", "status", "data_entrega"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     items: Optional[str] = Field(default=None)  # JSON string
@@ -65,23 +65,54 @@ def items_to_json_string(items: List[ItemPedido]) -> str:
     items_data = [item_to_plain_dict(item) for item in items]
     return orjson.dumps(items_data).decode("utf-8")
 
+def _items_from_data(items_data: Any) -> List[ItemPedido]:
+    """Constrói os ItemPedido a partir da lista já decodificada do JSON."""
+    normalized_items: List[ItemPedido] = []
+    for item_data in items_data:
+        # O dict acabou de sair do orjson: retirar acabamento nele mesmo, sem copiar
+        acabamento = normalize_acabamento(item_data.pop('acabamento', None))
+        normalized_items.append(ItemPedido(**item_data, acabamento=acabamento))
+    return normalized_items
+
 def json_string_to_items(items_json: str) -> List[ItemPedido]:
     """Converte string JSON para lista de items"""
     if not items_json:
         return []
     
     try:
-        items_data = orjson.loads(items_json)
-        normalized_items: List[ItemPedido] = []
-        for item_data in items_data:
-            acabamento = normalize_acabamento(item_data.get('acabamento'))
-            payload = {k: v for k, v in item_data.items() if k != 'acabamento'}
-            normalized_items.append(ItemPedido(**payload, acabamento=acabamento))
-        return normalized_items
+        return _items_from_data(orjson.loads(items_json))
     except (orjson.JSONDecodeError, Exception) as e:
         logger.error(f"Erro ao converter JSON para items: {e}")
         return []
 
+def json_strings_to_items(items_jsons: List[Optional[str]]) -> List[List[ItemPedido]]:
+    """
+    Converte várias strings JSON de items de uma vez.
+
+    Junta tudo num único array e decodifica com uma só chamada ao orjson;
+    se o lote não decodificar (algum pedido com JSON inválido) ou não tiver
+    um elemento por pedido, cai para a conversão individual.
+    """
+    if not items_jsons:
+        return []
+
+    batched = "[" + ",".join(items_json or "[]" for items_json in items_jsons) + "]"
+    try:
+        batch_data = orjson.loads(batched)
+    except orjson.JSONDecodeError:
+        batch_data = None
+    if batch_data is None or len(batch_data) != len(items_jsons):
+        return [json_string_to_items(items_json or "[]") for items_json in items_jsons]
+
+    result: List[List[ItemPedido]] = []
+    for items_data in batch_data:
+        try:
+            result.append(_items_from_data(items_data) if items_data is not None else [])
+        except Exception as e:
+            logger.error(f"Erro ao converter JSON para items: {e}")
+            result.append([])
+    return result
+
 def normalize_pedido_status(pedido: Pedido) -> None:
     """Normaliza o status de um pedido carregado do banco."""
     if not hasattr(pedido, 'status'):
@@ -2,15 +2,21 @@
 Módulo para cálculos de estatísticas de fechamentos.
 """
 
+import inspect
+import os
 from datetime import datetime, date, timedelta
+from functools import wraps
 from typing import Optional, List, Dict, Any
 from decimal import Decimal
 from sqlmodel import select, func, and_, or_
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy import text
-import orjson
+from sqlalchemy import Float, bindparam, case, cast, event, not_, text
+from sqlalchemy.orm import Session, object_session
 
-from pedidos.schema import Pedido, ItemPedido, Status, Acabamento
+from optimizations.cache import CACHE_MAXSIZE, TTLCache
+from pedidos.schema import Pedido, ItemPedido, Status
+# Reexportado: os relatórios usam o mesmo parse de itens do módulo de pedidos
+from pedidos.service import json_string_to_items, json_strings_to_items
 
 
 def parse_currency(value: Any) -> float:
@@ -22,6 +28,10 @@ def parse_currency(value: Any) -> float:
     if isinstance(value, Decimal):
         return float(value)
     if isinstance(value, str):
+        # Caminho rápido: formato canônico "123.45", gravado pelo sistema hoje
+        if value[-3:-2] == "." and value[:-3].isdecimal() and value[-2:].isdecimal():
+            return float(value)
+
         # Remove formatação de moeda
         cleaned = value.replace("R$", "").replace("$", "").strip()
         
@@ -69,31 +79,23 @@ def parse_currency(value: Any) -> float:
     return 0.0
 
 
-def normalize_acabamento(acabamento_value: Any) -> Optional[Acabamento]:
-    """Normaliza valor de acabamento para o tipo Acabamento."""
-    if isinstance(acabamento_value, Acabamento):
-        return acabamento_value
-    if isinstance(acabamento_value, dict):
-        return Acabamento(**acabamento_value)
-    return None
-
+# Campo de quantidade específico de cada tipo de produção
+_QUANTITY_FIELD_BY_TIPO = {
+    "painel": "quantidade_paineis",
+    "generica": "quantidade_paineis",
+    "totem": "quantidade_totem",
+    "lona": "quantidade_lona",
+    "adesivo": "quantidade_adesivo",
+}
 
-def json_string_to_items(items_json: str) -> List[ItemPedido]:
-    """Converte string JSON para lista de items."""
-    if not items_json:
-        return []
-    
-    try:
-        items_data = orjson.loads(items_json)
-        normalized_items: List[ItemPedido] = []
-        for item_data in items_data:
-            acabamento = normalize_acabamento(item_data.get('acabamento'))
-            payload = {k: v for k, v in item_data.items() if k != 'acabamento'}
-            normalized_items.append(ItemPedido(**payload, acabamento=acabamento))
-        return normalized_items
-    except (orjson.JSONDecodeError, Exception) as e:
-        print(f"Erro ao converter JSON para items: {e}")
-        return []
+_QUANTITY_FIELDS = (
+    "quantity",
+    "quantidade",
+    "quantidade_paineis",
+    "quantidade_totem",
+    "quantidade_lona",
+    "quantidade_adesivo",
+)
 
 
 def get_item_value(item: ItemPedido) -> float:
@@ -104,30 +106,18 @@ def get_item_value(item: ItemPedido) -> float:
         return parse_currency(subtotal)
     
     # Tenta calcular a partir de quantidade e valor unitario
-    quantity_candidates = [
-        getattr(item, 'quantity', None),
-        getattr(item, 'quantidade', None),
-        getattr(item, 'quantidade_paineis', None),
-        getattr(item, 'quantidade_totem', None),
-        getattr(item, 'quantidade_lona', None),
-        getattr(item, 'quantidade_adesivo', None),
-    ]
     unit_price = getattr(item, 'unit_price', None) or getattr(item, 'valor_unitario', None)
     if unit_price:
         tipo = (getattr(item, 'tipo_producao', None) or "").strip().lower()
-        tipo_map = {
-            "painel": getattr(item, 'quantidade_paineis', None),
-            "generica": getattr(item, 'quantidade_paineis', None),
-            "totem": getattr(item, 'quantidade_totem', None),
-            "lona": getattr(item, 'quantidade_lona', None),
-            "adesivo": getattr(item, 'quantidade_adesivo', None),
-        }
+        quantity_field = _QUANTITY_FIELD_BY_TIPO.get(tipo)
+        tipo_quantity = getattr(item, quantity_field, None) if quantity_field else None
         quantity_value = 1.0
-        if tipo in tipo_map and tipo_map[tipo] is not None:
-            quantity_value = parse_currency(tipo_map[tipo])
+        if tipo_quantity is not None:
+            quantity_value = parse_currency(tipo_quantity)
         else:
-            for raw_value in quantity_candidates:
-                value = parse_currency(raw_value)
+            # Sem quantidade do tipo: vale a maior quantidade informada
+            for field_name in _QUANTITY_FIELDS:
+                value = parse_currency(getattr(item, field_name, None))
                 if value > quantity_value:
                     quantity_value = value
         return quantity_value * parse_currency(unit_price)
@@ -152,19 +142,53 @@ def calculate_order_value(pedido: Pedido, items: List[ItemPedido]) -> float:
     return items_sum + frete
 
 
-async def get_filtered_orders(
-    session: AsyncSession,
+def calculate_order_value_sql():
+    """
+    Expressão SQL equivalente a `calculate_order_value` para pedidos cujo
+    valor_total está no formato canônico "X.XX" gravado pelo backend.
+    """
+    return money_sql(Pedido.valor_total)
+
+
+def money_sql(column):
+    """Valor monetário da coluna como REAL (válido apenas no formato canônico)."""
+    return cast(column, Float)
+
+
+def is_canonical_money(column):
+    """Condição SQL: a coluna está no formato "X.XX" (seguro para somar no banco)."""
+    return func.printf("%.2f", money_sql(column)) == column
+
+
+def cliente_like_condition(cliente: str):
+    """
+    Filtro parcial por cliente (case-insensitive). O padrão é montado uma vez
+    e vai como parâmetro nomeado, então o SQL compilado é o mesmo para
+    qualquer cliente e reaproveitado pelo cache de statements.
+    """
+    pattern = f"%{cliente.lower().strip()}%"
+    return func.lower(Pedido.cliente).like(bindparam("cliente_pattern", pattern))
+
+
+_ORDER_STATUS_MAP = {
+    "pendente": Status.PENDENTE,
+    "em processamento": Status.EM_PRODUCAO,
+    "em_producao": Status.EM_PRODUCAO,
+    "concluido": [Status.PRONTO, Status.ENTREGUE],
+    "pronto": Status.PRONTO,
+    "entregue": Status.ENTREGUE,
+    "cancelado": Status.CANCELADO,
+}
+
+
+def _build_order_conditions(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     status: Optional[str] = None,
-    date_mode: str = "entrega",  # "entrada" ou "entrega"
-    vendedor: Optional[str] = None,
-    designer: Optional[str] = None,
+    date_mode: str = "entrega",
     cliente: Optional[str] = None,
-) -> List[tuple[Pedido, List[ItemPedido]]]:
-    """Busca pedidos com filtros aplicados."""
-    # Query base
-    query = select(Pedido)
+) -> list:
+    """Monta as condições WHERE de pedido (data, status e cliente)."""
     conditions = []
     
     # Filtro por data
@@ -190,18 +214,9 @@ async def get_filtered_orders(
     
     # Filtro por status
     if status and status.lower() != "todos":
-        status_map = {
-            "pendente": Status.PENDENTE,
-            "em processamento": Status.EM_PRODUCAO,
-            "em_producao": Status.EM_PRODUCAO,
-            "concluido": [Status.PRONTO, Status.ENTREGUE],
-            "pronto": Status.PRONTO,
-            "entregue": Status.ENTREGUE,
-            "cancelado": Status.CANCELADO,
-        }
         normalized_status = status.lower().strip()
-        if normalized_status in status_map:
-            target_status = status_map[normalized_status]
+        if normalized_status in _ORDER_STATUS_MAP:
+            target_status = _ORDER_STATUS_MAP[normalized_status]
             if isinstance(target_status, list):
                 conditions.append(Pedido.status.in_(target_status))
             else:
@@ -209,7 +224,209 @@ async def get_filtered_orders(
     
     # Filtro por cliente
     if cliente:
-        conditions.append(Pedido.cliente.ilike(f"%{cliente}%"))
+        conditions.append(cliente_like_condition(cliente))
+    
+    return conditions
+
+
+# Cache próprio dos relatórios, com TTL curto. Ele vive em cada processo: a
+# invalidação abaixo só alcança o worker que gravou o pedido, e nos demais um
+# relatório pode ficar desatualizado por até RELATORIOS_CACHE_TTL segundos
+RELATORIOS_CACHE_TTL = int(os.getenv("RELATORIOS_CACHE_TTL", "5"))
+relatorios_cache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=RELATORIOS_CACHE_TTL)
+
+# Incrementada a cada invalidação: um relatório que estava sendo calculado
+# quando um pedido foi gravado não entra no cache com os dados de antes
+_relatorios_geracao = 0
+
+
+def _cached_report(func_):
+    """
+    Guarda o resultado no cache dos relatórios, com chave formada pelos filtros
+    (a sessão fica de fora). Painéis que recarregam a cada poucos segundos
+    com os mesmos filtros deixam de refazer a varredura dos pedidos.
+    """
+    signature = inspect.signature(func_)
+    prefix = f"{func_.__name__}:"
+
+    @wraps(func_)
+    async def wrapper(session: AsyncSession, *args: Any, **kwargs: Any):
+        bound = signature.bind(session, *args, **kwargs)
+        bound.apply_defaults()
+        filtros = tuple(
+            (name, value) for name, value in bound.arguments.items() if name != "session"
+        )
+        key = prefix + repr(filtros)
+        cached = relatorios_cache.get(key)
+        if cached is not None:
+            return cached
+        geracao = _relatorios_geracao
+        result = await func_(session, *args, **kwargs)
+        if geracao == _relatorios_geracao:
+            relatorios_cache.set(key, result)
+        return result
+
+    return wrapper
+
+
+def invalidate_relatorios_cache() -> None:
+    """Descarta os relatórios em cache (qualquer pedido gravado muda os totais)."""
+    global _relatorios_geracao
+    _relatorios_geracao += 1
+    # Sem relatório em cache não há o que invalidar (nem log a cada pedido gravado)
+    if relatorios_cache.cache:
+        relatorios_cache.invalidate()
+
+
+def _marcar_pedido_gravado(_mapper: Any, _connection: Any, target: Pedido) -> None:
+    # No flush os dados ainda não foram confirmados: um relatório calculado
+    # agora leria o estado antigo. Só marca a sessão; o cache cai no commit
+    session = object_session(target)
+    if session is not None:
+        session.info["relatorios_invalidar"] = True
+
+
+def _invalidar_apos_commit(session: Session) -> None:
+    if session.info.pop("relatorios_invalidar", False):
+        invalidate_relatorios_cache()
+
+
+def _descartar_marca(session: Session) -> None:
+    session.info.pop("relatorios_invalidar", None)
+
+
+for _evento in ("after_insert", "after_update", "after_delete"):
+    event.listen(Pedido, _evento, _marcar_pedido_gravado)
+event.listen(Session, "after_commit", _invalidar_apos_commit)
+event.listen(Session, "after_rollback", _descartar_marca)
+
+
+# Colunas lidas por calculate_order_value: evita hidratar o Pedido inteiro
+_ORDER_VALUE_COLUMNS = (Pedido.id, Pedido.valor_total, Pedido.valor_frete, Pedido.items)
+
+# Colunas lidas pelos consumidores de get_filtered_orders (relatórios e automação);
+# observações, endereço, flags de produção etc. não saem do banco
+_FILTERED_ORDER_COLUMNS = (
+    Pedido.id,
+    Pedido.numero,
+    Pedido.cliente,
+    Pedido.status,
+    Pedido.data_entrada,
+    Pedido.data_entrega,
+    Pedido.valor_total,
+    Pedido.valor_frete,
+    Pedido.items,
+    Pedido.ultima_atualizacao,
+)
+
+
+def _filter_items_by_person(
+    items: List[ItemPedido],
+    vendedor: Optional[str] = None,
+    designer: Optional[str] = None,
+) -> List[ItemPedido]:
+    """Mantém os itens cujo vendedor/designer contém o filtro (itens sem o campo passam)."""
+    filtered_items = []
+    for item in items:
+        item_vendedor = item.vendedor if hasattr(item, 'vendedor') else None
+        item_designer = item.designer if hasattr(item, 'designer') else None
+        
+        if vendedor and item_vendedor and vendedor.lower() not in item_vendedor.lower():
+            continue
+        if designer and item_designer and designer.lower() not in item_designer.lower():
+            continue
+        filtered_items.append(item)
+    return filtered_items
+
+
+async def sum_orders_value(session: AsyncSession, conditions: list) -> tuple[int, float]:
+    """
+    Retorna (quantidade, soma do valor) dos pedidos que atendem `conditions`.
+
+    Pedidos com valor_total canônico são somados direto no banco; só os demais
+    (valor vazio ou em formato legado) são lidos, numa segunda consulta
+    restrita a eles, e somados por `calculate_order_value`.
+    """
+    canonical = is_canonical_money(Pedido.valor_total)
+    aggregate_query = (
+        select(
+            func.count(),
+            func.coalesce(func.sum(case((canonical, calculate_order_value_sql()))), 0.0),
+            func.coalesce(func.sum(case((canonical, 0), else_=1)), 0),
+        )
+        .select_from(Pedido)
+        .where(*conditions)
+    )
+    total_pedidos, valor_total, legados = (await session.exec(aggregate_query)).one()
+    valor_total = float(valor_total)
+
+    if legados:
+        legacy_query = select(*_ORDER_VALUE_COLUMNS).where(
+            *conditions, or_(Pedido.valor_total.is_(None), not_(canonical))
+        )
+        result = await session.stream(legacy_query)
+        async for pedido in result:
+            valor_total += calculate_order_value(pedido, json_string_to_items(pedido.items or "[]"))
+
+    return total_pedidos, valor_total
+
+
+@_cached_report
+async def get_orders_value_total(
+    session: AsyncSession,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    status: Optional[str] = None,
+    date_mode: str = "entrega",
+    cliente: Optional[str] = None,
+    vendedor: Optional[str] = None,
+    designer: Optional[str] = None,
+) -> tuple[int, float]:
+    """
+    Retorna (quantidade, soma do valor) dos pedidos filtrados.
+
+    Sem filtros por item, a soma é a de `sum_orders_value`. Com
+    vendedor/designer, todos os pedidos do período são lidos, mas só com as
+    colunas usadas no cálculo.
+    """
+    conditions = _build_order_conditions(start_date, end_date, status, date_mode, cliente)
+    if not (vendedor or designer):
+        return await sum_orders_value(session, conditions)
+
+    total_pedidos = 0
+    valor_total = 0.0
+    result = await session.stream(select(*_ORDER_VALUE_COLUMNS).where(*conditions))
+    async for pedido in result:
+        items = _filter_items_by_person(
+            json_string_to_items(pedido.items or "[]"), vendedor, designer
+        )
+        if not items:
+            continue
+        valor_total += calculate_order_value(pedido, items)
+        total_pedidos += 1
+
+    return total_pedidos, valor_total
+
+
+async def get_filtered_orders(
+    session: AsyncSession,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    status: Optional[str] = None,
+    date_mode: str = "entrega",  # "entrada" ou "entrega"
+    vendedor: Optional[str] = None,
+    designer: Optional[str] = None,
+    cliente: Optional[str] = None,
+) -> List[tuple[Pedido, List[ItemPedido]]]:
+    """
+    Busca pedidos com filtros aplicados.
+
+    Cada pedido vem como linha com apenas as colunas de _FILTERED_ORDER_COLUMNS
+    (acesso por atributo, como no modelo), sem montar a entidade inteira.
+    """
+    # Query base
+    query = select(*_FILTERED_ORDER_COLUMNS)
+    conditions = _build_order_conditions(start_date, end_date, status, date_mode, cliente)
     
     if conditions:
         query = query.where(and_(*conditions))
@@ -217,25 +434,13 @@ async def get_filtered_orders(
     result = await session.exec(query)
     pedidos = result.all()
     
-    # Buscar itens para cada pedido (convertendo do JSON)
+    # Converter os items de todos os pedidos numa única decodificação JSON
+    items_por_pedido = json_strings_to_items([pedido.items for pedido in pedidos])
     pedidos_with_items = []
-    for pedido in pedidos:
-        # Converter items de JSON string para objetos
-        items = json_string_to_items(pedido.items or "[]")
-        
+    for pedido, items in zip(pedidos, items_por_pedido):
         # Aplicar filtros de vendedor/designer nos itens
         if vendedor or designer:
-            filtered_items = []
-            for item in items:
-                item_vendedor = item.vendedor if hasattr(item, 'vendedor') else None
-                item_designer = item.designer if hasattr(item, 'designer') else None
-                
-                if vendedor and item_vendedor and vendedor.lower() not in item_vendedor.lower():
-                    continue
-                if designer and item_designer and designer.lower() not in item_designer.lower():
-                    continue
-                filtered_items.append(item)
-            items = filtered_items
+            items = _filter_items_by_person(items, vendedor, designer)
         
         if items or not (vendedor or designer):  # Inclui pedidos sem itens se não há filtro de vendedor/designer
             pedidos_with_items.append((pedido, items))
@@ -287,6 +492,7 @@ async def get_fechamento_statistics(
     }
 
 
+@_cached_report
 async def get_fechamento_trends(
     session: AsyncSession,
     start_date: Optional[str] = None,
@@ -349,6 +555,7 @@ async def get_fechamento_trends(
     return trends
 
 
+@_cached_report
 async def get_fechamento_by_category(
     session: AsyncSession,
     category: str,  # "vendedor", "designer", "cliente", "tipo_producao"
@@ -3,7 +3,7 @@ Router para endpoints de Templates de Relatórios e Estatísticas de Fechamentos
 """
 
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import select
@@ -109,21 +109,31 @@ DEFAULT_TEMPLATES: Dict[RelatorioTemplateType, RelatorioTemplateData] = {
     "fechamentos": DEFAULT_FECHAMENTOS_TEMPLATE,
 }
 
+# Mapeamentos pré-computados entre o Literal da API e o Enum do banco
+_TEMPLATE_TYPE_ENUM_MAP: Dict[RelatorioTemplateType, RelatorioTemplateTypeEnum] = {
+    "envios": RelatorioTemplateTypeEnum.envios,
+    "fechamentos": RelatorioTemplateTypeEnum.fechamentos,
+}
+_TEMPLATE_TYPE_REVERSE_MAP: Dict[RelatorioTemplateTypeEnum, RelatorioTemplateType] = {
+    enum_value: template_type
+    for template_type, enum_value in _TEMPLATE_TYPE_ENUM_MAP.items()
+}
+
 
 def _build_template_response(
     template_type: RelatorioTemplateType,
-    template: Optional[RelatorioTemplateModel],
+    template: Optional[Mapping[str, Any]],
 ) -> RelatorioTemplateResponse:
-    """Constrói resposta do template."""
+    """Constrói resposta do template a partir de uma linha (mapping) do banco."""
     if template:
         data = RelatorioTemplateData(
-            title=template.title,
-            headerFields=template.headerFields or {},
-            styles=template.styles or {},
-            tableConfig=template.tableConfig,
-            pageConfig=template.pageConfig,
+            title=template["title"],
+            headerFields=template["headerFields"] or {},
+            styles=template["styles"] or {},
+            tableConfig=template["tableConfig"],
+            pageConfig=template["pageConfig"],
         )
-        updated_at = template.updatedAt
+        updated_at = template["updatedAt"]
     else:
         # Usar template padrão
         default_template = DEFAULT_TEMPLATES[template_type]
@@ -145,9 +155,27 @@ def _build_template_response(
 async def _load_templates_response(
     session: AsyncSession,
 ) -> RelatorioTemplatesResponse:
-    """Carrega templates do banco de dados."""
-    result = await session.exec(select(RelatorioTemplateModel))
-    templates = {tpl.template_type.value: tpl for tpl in result.all()}
+    """
+    Carrega templates do banco de dados.
+
+    Usa um select Core (colunas da tabela) em vez de entidades ORM: as linhas
+    são lidas uma única vez, então não há motivo para passar pelo identity map.
+    """
+    table = RelatorioTemplateModel.__table__
+    statement = select(
+        table.c.template_type,
+        table.c.title,
+        table.c.headerFields,
+        table.c.styles,
+        table.c.tableConfig,
+        table.c.pageConfig,
+        table.c.updatedAt,
+    )
+    result = await session.execute(statement)
+    templates = {
+        _TEMPLATE_TYPE_REVERSE_MAP[row["template_type"]]: row
+        for row in result.mappings().all()
+    }
 
     return RelatorioTemplatesResponse(
         envios=_build_template_response("envios", templates.get("envios")),
@@ -161,7 +189,7 @@ async def _upsert_template(
     session: AsyncSession,
 ) -> None:
     """Cria ou atualiza template no banco."""
-    template_type_enum = RelatorioTemplateTypeEnum(template_type)
+    template_type_enum = _TEMPLATE_TYPE_ENUM_MAP[template_type]
 
     statement = select(RelatorioTemplateModel).where(
         RelatorioTemplateModel.template_type == template_type_enum
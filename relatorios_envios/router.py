@@ -1,14 +1,46 @@
-from typing import List, Optional
+import logging
+from typing import AsyncIterator, List, Optional
 
-from fastapi import APIRouter, Depends, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from base import get_session
-from pedidos.router import listar_pedidos, MAX_PAGE_SIZE
+from pedidos.router import MAX_PAGE_SIZE, _validate_date_range, iter_pedidos
 from pedidos.schema import PedidoResponse, Status
 
 
 router = APIRouter(prefix="/relatorios-envios", tags=["Relatorios Envios"])
+logger = logging.getLogger(__name__)
+
+
+async def _json_array(
+    session: AsyncSession,
+    first: Optional[PedidoResponse],
+    pedidos: AsyncIterator[PedidoResponse],
+) -> AsyncIterator[bytes]:
+    """Emite os pedidos como um array JSON, um pedido por chunk."""
+    # A sessão do stream é própria (a de get_session fecha antes do corpo
+    # ser enviado) e é fechada aqui no final.
+    try:
+        if first is None:
+            yield b"[]"
+            return
+        yield b"["
+        yield orjson.dumps(first.model_dump(mode="json"))
+        async for pedido in pedidos:
+            yield b","
+            yield orjson.dumps(pedido.model_dump(mode="json"))
+        yield b"]"
+    except Exception:
+        # O status 200 já foi enviado: a exceção propagada aborta a conexão,
+        # e o cliente recebe um corpo incompleto (sem o "]" final) em vez de
+        # um array que parece válido
+        logger.exception("Erro durante o streaming do relatório de envios")
+        raise
+    finally:
+        await session.close()
 
 
 @router.get("/pedidos", response_model=List[PedidoResponse])
@@ -24,9 +56,19 @@ async def relatorio_envios(
     """
     Relatorio de envios (alias dedicado).
     Filtra sempre por data de entrega.
+
+    A resposta é enviada em streaming (array JSON montado pedido a pedido),
+    então o pico de memória não cresce com o tamanho do relatório. Um erro
+    no primeiro lote retorna 500; depois dele o status 200 já foi enviado e
+    uma falha interrompe a conexão, deixando o JSON incompleto.
     """
-    return await listar_pedidos(
-        session=session,
+    data_inicio, data_fim = _validate_date_range(data_inicio, data_fim)
+    # Sessão própria do stream, no mesmo bind: o exit da dependência fecha a
+    # sessão da requisição antes do corpo ser enviado, o que invalidaria o
+    # primeiro lote já lido
+    stream_session = AsyncSession(session.bind, expire_on_commit=False)
+    pedidos = iter_pedidos(
+        stream_session,
         skip=skip,
         limit=limit,
         status=status,
@@ -35,3 +77,14 @@ async def relatorio_envios(
         data_fim=data_fim,
         date_mode="entrega",
     )
+    # O primeiro lote é lido antes de iniciar a resposta: erros na consulta
+    # ainda viram um 500 com corpo de erro, e não um 200 com o array truncado
+    try:
+        first = await anext(pedidos, None)
+    except Exception:
+        await stream_session.close()
+        logger.exception("Erro ao gerar relatório de envios")
+        raise HTTPException(status_code=500, detail="Erro interno ao gerar relatorio de envios")
+    return StreamingResponse(
+        _json_array(stream_session, first, pedidos), media_type="application/json"
+    )
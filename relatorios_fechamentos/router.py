@@ -1,25 +1,36 @@
+import asyncio
+import re
+import unicodedata
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Callable, Dict, List, Mapping, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import String, case, cast, true
 from sqlmodel import select, func, and_, or_
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from base import get_session
-from pedidos.schema import Pedido, PedidoResponse, Status
+from pedidos.schema import ItemPedido, Pedido, PedidoResponse, Status
 from relatorios.fechamentos import (
-    calculate_order_value,
+    cliente_like_condition,
     get_fechamento_by_category,
     get_fechamento_trends,
-    get_filtered_orders,
     get_item_value,
+    get_orders_value_total,
     json_string_to_items,
     parse_currency,
+    sum_orders_value,
 )
 from .schema import (
+    RelatorioDashboardResponse,
     RelatorioQuantidadeResponse,
     RelatorioRankingResponse,
     RelatorioRankingItem,
+    RelatorioResumoResponse,
     RelatorioStatusItem,
     RelatorioStatusResponse,
     RelatorioTrendItem,
@@ -48,6 +59,21 @@ REPORT_TYPES = {
     "sintetico_entrega",
 }
 
+# date_mode aceito pelos endpoints de contagem/ranking e pelos relatórios
+_VALID_DATE_MODES = frozenset({"entrada", "entrega"})
+_REPORT_DATE_MODES = frozenset({"entrada", "entrega", "qualquer"})
+_VALID_FRETE_MODES = frozenset({"por_pedido", "proporcional"})
+
+# Sintéticos agrupados por campos do pedido (não do item): o grupo é resolvido
+# uma vez por pedido
+PEDIDO_LEVEL_SINTETICO_REPORTS = {
+    "sintetico_data",
+    "sintetico_data_entrada",
+    "sintetico_data_entrega",
+    "sintetico_cliente",
+    "sintetico_entrega",
+}
+
 REPORT_TITLES = {
     "analitico_designer_cliente": "Relatório Analítico — Designer × Cliente",
     "analitico_cliente_designer": "Relatório Analítico — Cliente × Designer",
@@ -67,30 +93,51 @@ REPORT_TITLES = {
 }
 
 
+# Os mesmos nomes de cliente/vendedor/designer se repetem em todas as linhas
+@lru_cache(maxsize=4096)
 def _normalize_text(value: str) -> str:
-    import unicodedata
+    if value.isascii():
+        # Sem acentos possíveis: NFKD + remoção de combinantes não mudariam nada
+        return value.lower().strip()
     normalized = unicodedata.normalize("NFKD", value)
     return "".join(ch for ch in normalized if not unicodedata.combining(ch)).lower().strip()
 
 
+# Sequências de caracteres não alfanuméricos (equivale a `not ch.isalnum()`)
+_SLUG_SEPARATOR_RE = re.compile(r"[\W_]+")
+
+
+@lru_cache(maxsize=4096)
 def _slugify(value: str) -> str:
-    cleaned = _normalize_text(value)
-    slug = []
-    prev_hyphen = False
-    for ch in cleaned:
-        if ch.isalnum():
-            slug.append(ch)
-            prev_hyphen = False
-        else:
-            if not prev_hyphen:
-                slug.append("-")
-                prev_hyphen = True
-    return "".join(slug).strip("-")
+    return _SLUG_SEPARATOR_RE.sub("-", _normalize_text(value)).strip("-")
+
+
+# GLOB que casa com qualquer texto que tenha um caractere fora do ASCII
+_NON_ASCII_GLOB = "*[^\x01-\x7f]*"
+
+
+def _normalized_contains(column: Any, normalized_filter: str):
+    """
+    Pré-filtro no banco: mantém toda linha cuja versão `_normalize_text` de
+    `column` pode conter `normalized_filter`. Texto só ASCII é comparado pelo
+    ILIKE, que para ele é a mesma comparação; qualquer texto com caractere não
+    ASCII (acentos em qualquer idioma, NFD, ligaduras) passa adiante para a
+    checagem exata em Python.
+    """
+    return or_(
+        column.ilike(f"%{normalized_filter}%"),
+        column.op("GLOB")(_NON_ASCII_GLOB),
+    )
 
 
 def _parse_query_date(value: Optional[str], label: str) -> Optional[date]:
     if not value:
         return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        pass
+    # strptime só para datas sem zero à esquerda (ex.: 2024-3-1)
     try:
         return datetime.strptime(value, "%Y-%m-%d").date()
     except ValueError as exc:
@@ -105,6 +152,12 @@ def _parse_order_date(value: Any) -> Optional[date]:
     if isinstance(value, datetime):
         return value.date()
     if isinstance(value, str):
+        if len(value) == 10:
+            # Caso mais comum (YYYY-MM-DD): parse direto, sem passar por datetime
+            try:
+                return date.fromisoformat(value)
+            except ValueError:
+                pass
         try:
             return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
         except ValueError:
@@ -125,23 +178,41 @@ def _date_in_range(value: Optional[date], start: Optional[date], end: Optional[d
     return True
 
 
-def _matches_status(pedido: Pedido, status: Optional[str]) -> bool:
-    if not status or _normalize_text(status) == "todos":
-        return True
+STATUS_MAP: Mapping[str, frozenset[Status]] = MappingProxyType({
+    "pendente": frozenset({Status.PENDENTE}),
+    "em processamento": frozenset({Status.EM_PRODUCAO}),
+    "em producao": frozenset({Status.EM_PRODUCAO}),
+    "em_producao": frozenset({Status.EM_PRODUCAO}),
+    # No Fechamento, "concluido" agora inclui tudo o que está ativo (incluindo pendentes)
+    # para bater com a visão financeira de faturamento do mês.
+    "concluido": frozenset({Status.PENDENTE, Status.EM_PRODUCAO, Status.PRONTO, Status.ENTREGUE}),
+    "cancelado": frozenset({Status.CANCELADO}),
+})
+
+STATUS_DISPLAY_MAP: Mapping[str, str] = MappingProxyType({
+    "pendente": "Pendente",
+    "em processamento": "Em Processamento",
+    "em producao": "Em Processamento",
+    "em_producao": "Em Processamento",
+    "concluido": "Concluído",
+    "cancelado": "Cancelado",
+})
+
+
+@lru_cache(maxsize=16)
+def _resolve_status_set(status: Optional[str]) -> Optional[frozenset[Status]]:
+    """
+    Resolve o filtro de status para o conjunto de Status aceitos (None = todos).
+    Memoizado: o frontend envia sempre os mesmos poucos valores.
+    """
+    if not status:
+        return None
     normalized = _normalize_text(status)
-    status_map = {
-        "pendente": {Status.PENDENTE},
-        "em processamento": {Status.EM_PRODUCAO},
-        "em producao": {Status.EM_PRODUCAO},
-        "em_producao": {Status.EM_PRODUCAO},
-        # No Fechamento, "concluido" agora inclui tudo o que está ativo (incluindo pendentes)
-        # para bater com a visão financeira de faturamento do mês.
-        "concluido": {Status.PENDENTE, Status.EM_PRODUCAO, Status.PRONTO, Status.ENTREGUE},
-        "cancelado": {Status.CANCELADO},
-    }
-    if normalized not in status_map:
+    if normalized == "todos":
+        return None
+    if normalized not in STATUS_MAP:
         raise HTTPException(status_code=400, detail="status invalido")
-    return pedido.status in status_map[normalized]
+    return STATUS_MAP[normalized]
 
 
 def _format_period_label(start: Optional[date], end: Optional[date]) -> str:
@@ -154,49 +225,75 @@ def _format_period_label(start: Optional[date], end: Optional[date]) -> str:
     return "Período não especificado"
 
 
+@lru_cache(maxsize=16)
 def _format_status_label(status: Optional[str]) -> str:
-    if not status or _normalize_text(status) == "todos":
+    normalized = _normalize_text(status) if status else None
+    if not normalized or normalized == "todos":
         return "Status: Todos"
-    normalized = _normalize_text(status)
-    display_map = {
-        "pendente": "Pendente",
-        "em processamento": "Em Processamento",
-        "em producao": "Em Processamento",
-        "em_producao": "Em Processamento",
-        "concluido": "Concluído",
-        "cancelado": "Cancelado",
-    }
-    if normalized not in display_map:
+    if normalized not in STATUS_DISPLAY_MAP:
         raise HTTPException(status_code=400, detail="status invalido")
-    return f"Status: {display_map[normalized]}"
+    return f"Status: {STATUS_DISPLAY_MAP[normalized]}"
 
 
 def _get_effective_date(pedido: Pedido) -> Optional[date]:
     return _parse_order_date(pedido.data_entrega) or _parse_order_date(pedido.data_entrada)
 
 
-def _filter_by_date(
-    pedido: Pedido,
+def _make_date_filter(
     start: Optional[date],
     end: Optional[date],
     date_mode: Optional[str],
-) -> bool:
+) -> Callable[[Any], bool]:
+    """
+    Monta, uma vez por requisição, o filtro de data aplicado a cada pedido:
+    o modo de data já fica resolvido na closure, sem reavaliá-lo por linha.
+    """
     if not start and not end:
-        return True
+        return lambda pedido: True
     if not date_mode:
-        return _date_in_range(_get_effective_date(pedido), start, end)
+        return lambda pedido: _date_in_range(_get_effective_date(pedido), start, end)
     normalized = date_mode.lower().strip()
     if normalized == "entrada":
-        return _date_in_range(_parse_order_date(pedido.data_entrada), start, end)
+        return lambda pedido: _date_in_range(_parse_order_date(pedido.data_entrada), start, end)
     if normalized == "entrega":
-        return _date_in_range(_parse_order_date(pedido.data_entrega), start, end)
+        return lambda pedido: _date_in_range(_parse_order_date(pedido.data_entrega), start, end)
     # if normalized == "qualquer":
-    #     return _date_in_range(_parse_order_date(pedido.data_entrada), start, end) or _date_in_range(
+    #     return lambda pedido: _date_in_range(_parse_order_date(pedido.data_entrada), start, end) or _date_in_range(
     #         _parse_order_date(pedido.data_entrega),
     #         start,
     #         end,
     #     )
-    raise HTTPException(status_code=400, detail="date_mode invalido")
+
+    def _reject(pedido: Any) -> bool:
+        raise HTTPException(status_code=400, detail="date_mode invalido")
+
+    return _reject
+
+
+def _make_item_filter(
+    filtro_vendedor: Optional[str],
+    filtro_designer: Optional[str],
+) -> Optional[Callable[[List[Any]], List[Any]]]:
+    """
+    Filtro de itens por vendedor/designer (já normalizados), especializado
+    uma vez por requisição conforme os filtros informados. None sem filtros.
+    """
+    if filtro_vendedor and filtro_designer:
+        return lambda items: [
+            item
+            for item in items
+            if filtro_vendedor in _normalize_text(getattr(item, "vendedor", "") or "")
+            and filtro_designer in _normalize_text(getattr(item, "designer", "") or "")
+        ]
+    if filtro_vendedor:
+        return lambda items: [
+            item for item in items if filtro_vendedor in _normalize_text(getattr(item, "vendedor", "") or "")
+        ]
+    if filtro_designer:
+        return lambda items: [
+            item for item in items if filtro_designer in _normalize_text(getattr(item, "designer", "") or "")
+        ]
+    return None
 
 
 def _normalize_name(value: Optional[str], default: str) -> str:
@@ -212,22 +309,64 @@ def _normalize_frete_distribution(value: Optional[str], report_type: str) -> str
     if not value:
         return "por_pedido"
     normalized = value.lower().strip()
-    if normalized not in {"por_pedido", "proporcional"}:
+    if normalized not in _VALID_FRETE_MODES:
         raise HTTPException(status_code=400, detail="frete_distribution invalido")
     return normalized
 
 
-def _build_row(item: Any, pedido: Pedido, valor_frete: float, valor_servico: float) -> Dict[str, Any]:
+def _split_pedido_values(
+    item_values: List[float],
+    frete_total: float,
+    pedido_valor_total: float,
+    proporcional: bool,
+) -> Tuple[List[float], List[float]]:
+    """
+    Núcleo numérico de cada pedido: frete por item (rateado pelo valor ou
+    repetido por item) e ajuste do serviço para bater com
+    valor_total - frete. Altera e retorna `item_values` e o frete por item.
+    """
+    total_servico_pedido = sum(item_values)
+    if proporcional and total_servico_pedido > 0:
+        frete_items = [frete_total * (value / total_servico_pedido) for value in item_values]
+    elif proporcional:
+        frete_items = [0.0] * len(item_values)
+    else:
+        frete_items = [frete_total] * len(item_values)
+
+    if pedido_valor_total > 0.01 and item_values:
+        expected_servico_total = round(pedido_valor_total - frete_total, 2)
+        adjustment = round(expected_servico_total - total_servico_pedido, 2)
+        # Absorver ajuste silenciosamente no último item real, sem criar item fantasma.
+        # Isso evita que um grupo "Tipo: Ajuste" apareça no relatório do cliente.
+        if abs(adjustment) > 0.01:
+            item_values[-1] = round(item_values[-1] + adjustment, 2)
+    return item_values, frete_items
+
+
+# Linha analítica: (ficha, descricao, valor_frete, valor_servico)
+_Row = Tuple[str, str, float, float]
+
+
+def _build_row(item: Any, pedido: Pedido, valor_frete: float, valor_servico: float) -> _Row:
     ficha = pedido.numero or str(pedido.id or "")
     descricao = getattr(item, "descricao", None) or getattr(item, "tipo_producao", None) or "Item"
-    return {
-        "ficha": ficha,
-        "descricao": descricao,
-        "valor_frete": round(valor_frete, 2),
-        "valor_servico": round(valor_servico, 2),
-    }
+    # Valores sem arredondar: o round acontece uma vez, ao montar a resposta
+    return (ficha, descricao, valor_frete, valor_servico)
+
+
+def _finalize_rows(rows: List[_Row]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "ficha": ficha,
+            "descricao": descricao,
+            "valor_frete": round(valor_frete, 2),
+            "valor_servico": round(valor_servico, 2),
+        }
+        for ficha, descricao, valor_frete, valor_servico in rows
+    ]
 
 
+@lru_cache(maxsize=4096)
 def _format_group_label(prefix: str, value: Optional[str], default: str) -> Tuple[str, str]:
     label_value = _normalize_name(value, default)
     label = f"{prefix}: {label_value}"
@@ -306,36 +445,148 @@ def _get_sintetico_group(
     raise HTTPException(status_code=400, detail="report_type invalido")
 
 
-def _ensure_group(groups: Dict[str, Dict[str, Any]], key: str, label: str, use_subgroups: bool) -> Dict[str, Any]:
-    if key not in groups:
-        groups[key] = {
-            "key": key,
-            "label": label,
-            "rows": [],
-            "subgroups": {} if use_subgroups else None,
-            "subtotal": {"valor_frete": 0.0, "valor_servico": 0.0},
-            "_pedido_ids": set(),
-            "_items_count": 0,
-        }
-    return groups[key]
-
-
-def _ensure_subgroup(group: Dict[str, Any], key: str, label: str) -> Dict[str, Any]:
-    subgroups = group["subgroups"]
-    if key not in subgroups:
-        subgroups[key] = {
-            "key": key,
-            "label": label,
-            "rows": [],
-            "subtotal": {"valor_frete": 0.0, "valor_servico": 0.0},
-            "_pedido_ids": set(),
-        }
-    return subgroups[key]
+# Campos do item lidos no banco: rótulos dos grupos e os usados por get_item_value
+_ITEM_JSON_FIELDS = (
+    "descricao",
+    "tipo_producao",
+    "designer",
+    "vendedor",
+    "subtotal",
+    "quantity",
+    "quantidade",
+    "quantidade_paineis",
+    "quantidade_totem",
+    "quantidade_lona",
+    "quantidade_adesivo",
+    "unit_price",
+    "valor_unitario",
+)
+
+# Campos declarados como texto em ItemPedido: o json_each não passa pela validação
+# do modelo, então um número/booleano no JSON viraria int e quebraria o .strip()
+# e a normalização dos rótulos. Chegam como texto (objetos e listas já saem do
+# json_extract como texto JSON)
+_ITEM_TEXT_FIELDS = frozenset(name for name in _ITEM_JSON_FIELDS if name in ItemPedido.model_fields)
+
+
+def _item_field_sql(item_value: Any, name: str):
+    value = func.json_extract(item_value, f"$.{name}")
+    if name in _ITEM_TEXT_FIELDS:
+        return cast(value, String)
+    return value
+
+
+async def _stream_pedidos_with_items(
+    session: AsyncSession,
+    conditions: list,
+    item_filters: Mapping[str, str] = MappingProxyType({}),
+) -> AsyncIterator[Tuple[Any, List[Any]]]:
+    """
+    Decompõe o JSON de itens no próprio SQLite (json_each): uma linha por
+    item já com os campos extraídos, em vez de decodificar e validar o JSON
+    de cada pedido em Python. Gera (pedido, itens) na ordem dos pedidos.
+
+    `item_filters` (campo do item -> filtro normalizado) descarta no banco os itens
+    que não podem passar no filtro por vendedor/designer; pedidos sem nenhum
+    item restante nem chegam ao Python.
+    """
+    # CASE aninhado: json_type falha em JSON inválido, então só roda após json_valid
+    items_array = case(
+        (
+            func.json_valid(Pedido.items) == 1,
+            case((func.json_type(Pedido.items) == "array", Pedido.items)),
+        )
+    )
+    item = func.json_each(items_array).table_valued("key", "value", "type").alias("item")
+    query = (
+        select(
+            Pedido.id,
+            Pedido.numero,
+            Pedido.cliente,
+            Pedido.forma_envio,
+            Pedido.data_entrada,
+            Pedido.data_entrega,
+            Pedido.valor_frete,
+            Pedido.valor_total,
+            *(_item_field_sql(item.c.value, name).label(name) for name in _ITEM_JSON_FIELDS),
+        )
+        .select_from(Pedido)
+        .join(item, true())
+        .where(
+            *conditions,
+            item.c.type == "object",
+            *(
+                _normalized_contains(_item_field_sql(item.c.value, name), filtro)
+                for name, filtro in item_filters.items()
+            ),
+        )
+        .order_by(Pedido.id, item.c.key)
+    )
+
+    result = await session.stream(query)
+    pedido = None
+    items: List[Any] = []
+    async for row in result:
+        if pedido is None or row.id != pedido.id:
+            if pedido is not None:
+                yield pedido, items
+            pedido = row
+            items = []
+        # A própria Row serve de item: já expõe os campos extraídos como atributos
+        items.append(row)
+    if pedido is not None:
+        yield pedido, items
+
+
+@dataclass(slots=True)
+class _GroupAccum:
+    """Acumulador de um grupo/subgrupo do relatório de fechamento."""
+
+    key: str
+    label: str
+    subgroups: Optional[Dict[str, "_GroupAccum"]] = None
+    rows: List[_Row] = field(default_factory=list)
+    valor_frete: float = 0.0
+    valor_servico: float = 0.0
+    last_pedido_id: Optional[int] = None
+    pedidos_count: int = 0
+    items_count: int = 0
+    # Chave de ordenação calculada uma vez, na criação do grupo
+    sort_key: str = field(init=False, default="")
+
+    def __post_init__(self) -> None:
+        self.sort_key = _group_sort_key(self.label)
+
+    def mark_pedido(self, pedido_id: int) -> bool:
+        """
+        Registra o pedido no grupo; True na primeira linha dele. Os pedidos
+        chegam em ordem de id com os itens juntos, então basta comparar com
+        o último id em vez de guardar um set de ids por grupo.
+        """
+        if self.last_pedido_id == pedido_id:
+            return False
+        self.last_pedido_id = pedido_id
+        self.pedidos_count += 1
+        return True
+
+
+def _ensure_group(groups: Dict[str, _GroupAccum], key: str, label: str, use_subgroups: bool) -> _GroupAccum:
+    group = groups.get(key)
+    if group is None:
+        group = groups[key] = _GroupAccum(key, label, {} if use_subgroups else None)
+    return group
+
+
+def _ensure_subgroup(group: _GroupAccum, key: str, label: str) -> _GroupAccum:
+    subgroup = group.subgroups.get(key)
+    if subgroup is None:
+        subgroup = group.subgroups[key] = _GroupAccum(key, label)
+    return subgroup
 
 
 def _normalize_date_mode(date_mode: Optional[str]) -> str:
     mode = (date_mode or "entrada").lower().strip()
-    if mode not in {"entrada", "entrega"}:
+    if mode not in _VALID_DATE_MODES:
         raise HTTPException(
             status_code=400,
             detail="date_mode invalido. Use: entrada ou entrega",
@@ -343,23 +594,50 @@ def _normalize_date_mode(date_mode: Optional[str]) -> str:
     return mode
 
 
-def _apply_date_filters(
-    filters,
+def _date_range_condition(column, start: Optional[date], end: Optional[date]):
+    """
+    Predicado único de intervalo semiaberto [start, end + 1 dia) sobre a
+    coluna crua (None sem datas). As datas são strings ISO, então a
+    comparação léxica equivale a comparar `date(coluna)` e o índice da
+    coluna vira uma única varredura por faixa. `between` não serve aqui:
+    é fechado nos dois lados e incluiria a meia-noite do dia seguinte.
+    """
+    if start and end:
+        return and_(column >= start.isoformat(), column < (end + timedelta(days=1)).isoformat())
+    if start:
+        return column >= start.isoformat()
+    if end:
+        return column < (end + timedelta(days=1)).isoformat()
+    return None
+
+
+def _date_filter_conditions(
     date_mode: str,
     data_inicio: Optional[str],
     data_fim: Optional[str],
-):
+) -> list:
     date_field = Pedido.data_entrada if date_mode == "entrada" else Pedido.data_entrega
 
+    conditions: list = []
     if date_mode == "entrega":
-        filters = filters.where(Pedido.data_entrega.isnot(None))
+        conditions.append(Pedido.data_entrega.isnot(None))
+
+    start = _parse_query_date(data_inicio, "data_inicio")
+    end = _parse_query_date(data_fim, "data_fim")
+    condition = _date_range_condition(date_field, start, end)
+    if condition is not None:
+        conditions.append(condition)
 
-    if data_inicio:
-        filters = filters.where(func.date(date_field) >= data_inicio)
-    if data_fim:
-        filters = filters.where(func.date(date_field) <= data_fim)
+    return conditions
 
-    return filters
+
+def _apply_date_filters(
+    filters,
+    date_mode: str,
+    data_inicio: Optional[str],
+    data_fim: Optional[str],
+):
+    return filters.where(*_date_filter_conditions(date_mode, data_inicio, data_fim))
 
 
 @router.get("/pedidos/quantidade", response_model=RelatorioQuantidadeResponse)
@@ -380,7 +658,7 @@ async def quantidade_pedidos(
             query = query.where(Pedido.status == status)
 
         if cliente:
-            query = query.where(func.lower(Pedido.cliente).like(f"%{cliente.lower().strip()}%"))
+            query = query.where(cliente_like_condition(cliente))
 
         if data_inicio or data_fim:
             query = _apply_date_filters(query, normalized_mode, data_inicio, data_fim)
@@ -416,7 +694,7 @@ async def quantidade_por_status(
         query = select(Pedido.status, func.count()).group_by(Pedido.status).order_by(func.count().desc())
 
         if cliente:
-            query = query.where(func.lower(Pedido.cliente).like(f"%{cliente.lower().strip()}%"))
+            query = query.where(cliente_like_condition(cliente))
 
         if data_inicio or data_fim:
             query = _apply_date_filters(query, normalized_mode, data_inicio, data_fim)
@@ -441,6 +719,65 @@ async def quantidade_por_status(
         ) from exc
 
 
+@router.get("/pedidos/resumo", response_model=RelatorioResumoResponse)
+async def resumo_pedidos(
+    session: AsyncSession = Depends(get_session),
+    data_inicio: Optional[str] = Query(None, description="Data inicial (YYYY-MM-DD)"),
+    data_fim: Optional[str] = Query(None, description="Data final (YYYY-MM-DD)"),
+    date_mode: str = Query("entrada", description="Modo de data: 'entrada' ou 'entrega'"),
+    cliente: Optional[str] = Query(default=None),
+) -> RelatorioResumoResponse:
+    """
+    Quantidade total, quantidade por status e valor total dos pedidos, em
+    vez de uma consulta por endpoint. O valor vem de `sum_orders_value`, a
+    mesma soma do /pedidos/valor-total; as quantidades por status saem de
+    uma única varredura com agregados condicionais.
+    """
+    try:
+        normalized_mode = _normalize_date_mode(date_mode)
+        conditions: list = []
+        if cliente:
+            conditions.append(cliente_like_condition(cliente))
+        if data_inicio or data_fim:
+            conditions.extend(_date_filter_conditions(normalized_mode, data_inicio, data_fim))
+
+        total, valor_total = await sum_orders_value(session, conditions)
+
+        status_query = (
+            select(
+                *(func.coalesce(func.sum(case((Pedido.status == item, 1), else_=0)), 0) for item in Status)
+            )
+            .select_from(Pedido)
+            .where(*conditions)
+        )
+        status_totals = (await session.exec(status_query)).one()
+
+        por_status = sorted(
+            (
+                RelatorioStatusItem(status=item.value, total=status_total)
+                for item, status_total in zip(Status, status_totals)
+                if status_total
+            ),
+            key=lambda item: item.total,
+            reverse=True,
+        )
+        return RelatorioResumoResponse(
+            total=total,
+            valor_total=round(valor_total, 2),
+            por_status=por_status,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            date_mode=normalized_mode,
+            cliente=cliente,
+        )
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(
+            status_code=500, detail=f"Erro ao gerar relatorio: {exc}"
+        ) from exc
+
+
 @router.get("/pedidos/por-cliente", response_model=RelatorioRankingResponse)
 async def ranking_por_cliente(
     session: AsyncSession = Depends(get_session),
@@ -593,6 +930,60 @@ async def ranking_por_tipo_producao(
         ) from exc
 
 
+async def _ranking_em_sessao_propria(bind: Any, category: str, **filtros: Any) -> List[RelatorioRankingItem]:
+    # Uma sessão (e conexão) por ranking: queries simultâneas não podem dividir a mesma sessão
+    async with AsyncSession(bind, expire_on_commit=False) as session:
+        ranking_raw = await get_fechamento_by_category(session, category=category, **filtros)
+    return [RelatorioRankingItem(**item) for item in ranking_raw]
+
+
+@router.get("/dashboard", response_model=RelatorioDashboardResponse)
+async def dashboard_fechamentos(
+    session: AsyncSession = Depends(get_session),
+    data_inicio: Optional[str] = Query(None, description="Data inicial (YYYY-MM-DD)"),
+    data_fim: Optional[str] = Query(None, description="Data final (YYYY-MM-DD)"),
+    date_mode: str = Query("entrada", description="Modo de data: 'entrada' ou 'entrega'"),
+    status: Optional[str] = Query(None, description="Status dos pedidos"),
+    limit: int = Query(10, ge=1, le=50, description="Numero maximo de resultados"),
+) -> RelatorioDashboardResponse:
+    """
+    Rankings por cliente, vendedor, designer e tipo de produção em uma única
+    chamada. As quatro consultas rodam em paralelo, então a latência é a da
+    mais lenta, e não a soma delas.
+    """
+    try:
+        normalized_mode = _normalize_date_mode(date_mode)
+        filtros = {
+            "start_date": data_inicio,
+            "end_date": data_fim,
+            "status": status,
+            "date_mode": normalized_mode,
+            "limit": limit,
+        }
+        por_cliente, por_vendedor, por_designer, por_tipo_producao = await asyncio.gather(
+            *(
+                _ranking_em_sessao_propria(session.bind, category, **filtros)
+                for category in ("cliente", "vendedor", "designer", "tipo_producao")
+            )
+        )
+        return RelatorioDashboardResponse(
+            por_cliente=por_cliente,
+            por_vendedor=por_vendedor,
+            por_designer=por_designer,
+            por_tipo_producao=por_tipo_producao,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            date_mode=normalized_mode,
+            status=status,
+        )
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(
+            status_code=500, detail=f"Erro ao gerar relatorio: {exc}"
+        ) from exc
+
+
 @router.get("/pedidos/tendencia", response_model=RelatorioTrendResponse)
 async def tendencia_pedidos(
     session: AsyncSession = Depends(get_session),
@@ -644,22 +1035,19 @@ async def valor_total_pedidos(
     """Totaliza valor dos pedidos conforme filtros."""
     try:
         normalized_mode = _normalize_date_mode(date_mode)
-        pedidos_with_items = await get_filtered_orders(
+        total_pedidos, total = await get_orders_value_total(
             session,
             start_date=data_inicio,
             end_date=data_fim,
             status=status,
             date_mode=normalized_mode,
+            cliente=cliente,
             vendedor=vendedor,
             designer=designer,
-            cliente=cliente,
         )
-        total = 0.0
-        for pedido, items in pedidos_with_items:
-            total += calculate_order_value(pedido, items)
         total = round(total, 2)
         return RelatorioValorTotalResponse(
-            total_pedidos=len(pedidos_with_items),
+            total_pedidos=total_pedidos,
             valor_total=total,
             data_inicio=data_inicio,
             data_fim=data_fim,
@@ -699,135 +1087,123 @@ async def relatorio_fechamentos(
         raise HTTPException(status_code=400, detail="start_date deve ser menor ou igual a end_date")
 
     normalized_date_mode = date_mode.lower().strip() if date_mode else None
-    if normalized_date_mode and normalized_date_mode not in {"entrada", "entrega", "qualquer"}:
+    if normalized_date_mode and normalized_date_mode not in _REPORT_DATE_MODES:
         raise HTTPException(status_code=400, detail="date_mode invalido")
 
     frete_mode = _normalize_frete_distribution(frete_distribution, report_type)
+    allowed_status = _resolve_status_set(status)
 
     filtro_vendedor = _normalize_text(vendedor) if vendedor else None
     filtro_designer = _normalize_text(designer) if designer else None
     filtro_cliente = _normalize_text(cliente) if cliente else None
+    date_ok = _make_date_filter(start, end, normalized_date_mode)
+    item_filter = _make_item_filter(filtro_vendedor, filtro_designer)
 
-    query = select(Pedido)
-    start_value = start.strftime("%Y-%m-%d")
-    end_value = end.strftime("%Y-%m-%d")
-
+    conditions: list = []
     if normalized_date_mode == "entrada":
-        query = query.where(
-            func.date(Pedido.data_entrada) >= start_value,
-            func.date(Pedido.data_entrada) <= end_value,
-        )
+        if start or end:
+            conditions.append(_date_range_condition(Pedido.data_entrada, start, end))
     elif normalized_date_mode == "entrega":
-        query = query.where(
-            Pedido.data_entrega.isnot(None),
-            func.date(Pedido.data_entrega) >= start_value,
-            func.date(Pedido.data_entrega) <= end_value,
-        )
-    else:
-        query = query.where(
+        conditions.append(Pedido.data_entrega.isnot(None))
+        if start or end:
+            conditions.append(_date_range_condition(Pedido.data_entrega, start, end))
+    elif start or end:
+        conditions.append(
             or_(
-                and_(
-                    func.date(Pedido.data_entrada) >= start_value,
-                    func.date(Pedido.data_entrada) <= end_value,
-                ),
-                and_(
-                    func.date(Pedido.data_entrega) >= start_value,
-                    func.date(Pedido.data_entrega) <= end_value,
-                ),
+                _date_range_condition(Pedido.data_entrada, start, end),
+                _date_range_condition(Pedido.data_entrega, start, end),
             )
         )
 
-    result = await session.exec(query)
-    pedidos = result.all()
+    if allowed_status is not None:
+        conditions.append(Pedido.status.in_(tuple(allowed_status)))
 
-    groups: Dict[str, Dict[str, Any]] = {}
+    if filtro_cliente:
+        # Pré-filtro no banco; a checagem exata com _normalize_text continua no loop
+        conditions.append(_normalized_contains(Pedido.cliente, filtro_cliente))
+
+    groups: Dict[str, _GroupAccum] = {}
     total = {"valor_frete": 0.0, "valor_servico": 0.0}
-    total_frete_ids: set[int] = set()
 
-    for pedido in pedidos:
+    # Invariantes do laço, resolvidas uma vez
+    proporcional = frete_mode == "proporcional"
+    is_analitico = report_type.startswith("analitico_")
+    pedido_level_group = report_type in PEDIDO_LEVEL_SINTETICO_REPORTS
+
+    # Pré-filtro dos itens no banco; a checagem exata (item_filter) continua no laço
+    item_filters = {
+        name: filtro
+        for name, filtro in (("vendedor", filtro_vendedor), ("designer", filtro_designer))
+        if filtro
+    }
+
+    # Agrega conforme as linhas chegam, sem materializar todos os pedidos
+    async for pedido, items in _stream_pedidos_with_items(session, conditions, item_filters):
         pedido_id = int(pedido.id or 0)
-        if not _matches_status(pedido, status):
-            continue
         if filtro_cliente:
             if not pedido.cliente or filtro_cliente not in _normalize_text(pedido.cliente):
                 continue
-        if not _filter_by_date(pedido, start, end, normalized_date_mode):
+        if not date_ok(pedido):
             continue
 
-        items = json_string_to_items(pedido.items or "[]")
-        if filtro_vendedor or filtro_designer:
-            filtered_items = []
-            for item in items:
-                if filtro_vendedor:
-                    item_vendedor = _normalize_text(getattr(item, "vendedor", "") or "")
-                    if filtro_vendedor not in item_vendedor:
-                        continue
-                if filtro_designer:
-                    item_designer = _normalize_text(getattr(item, "designer", "") or "")
-                    if filtro_designer not in item_designer:
-                        continue
-                filtered_items.append(item)
-            items = filtered_items
+        if item_filter is not None:
+            items = item_filter(items)
 
         if not items:
             continue
 
-        item_values = [get_item_value(item) for item in items]
-        total_servico_pedido = sum(item_values)
         frete_total = parse_currency(pedido.valor_frete) or 0.0
-        pedido_valor_total = parse_currency(pedido.valor_total) or 0.0
-
-        if frete_mode == "proporcional" and total_servico_pedido > 0:
-            frete_items = [frete_total * (value / total_servico_pedido) for value in item_values]
-        elif frete_mode == "proporcional":
-            frete_items = [0.0 for _ in item_values]
-        else:
-            frete_items = [frete_total for _ in item_values]
-
-        adjustment = 0.0
-        if pedido_valor_total > 0.01:
-            expected_servico_total = round(pedido_valor_total - frete_total, 2)
-            adjustment = round(expected_servico_total - total_servico_pedido, 2)
-
-        # Absorver ajuste silenciosamente no último item real, sem criar item fantasma.
-        # Isso evita que um grupo "Tipo: Ajuste" apareça no relatório do cliente.
-        if abs(adjustment) > 0.01 and item_values:
-            item_values[-1] = round(item_values[-1] + adjustment, 2)
+        item_values, frete_items = _split_pedido_values(
+            [get_item_value(item) for item in items],
+            frete_total,
+            parse_currency(pedido.valor_total) or 0.0,
+            proporcional,
+        )
 
         total["valor_servico"] += sum(item_values)
-        if frete_mode == "proporcional":
+        if proporcional:
             total["valor_frete"] += sum(frete_items)
         else:
-            if pedido_id not in total_frete_ids:
-                total["valor_frete"] += frete_total
-                total_frete_ids.add(pedido_id)
-
-        is_analitico = report_type.startswith("analitico_")
+            # Cada pedido chega uma única vez (itens agrupados pelo stream)
+            total["valor_frete"] += frete_total
 
-        for item, item_value, item_frete in zip(items, item_values, frete_items):
-            if is_analitico:
+        if is_analitico:
+            for item, item_value, item_frete in zip(items, item_values, frete_items):
                 group_info, subgroup_info = _get_analitico_keys(report_type, pedido, item)
                 group_key, group_label = group_info
                 subgroup_key, subgroup_label = subgroup_info
                 group = _ensure_group(groups, group_key, group_label, use_subgroups=True)
                 subgroup = _ensure_subgroup(group, subgroup_key, subgroup_label)
-                subgroup["rows"].append(_build_row(item, pedido, item_frete, item_value))
-                subgroup["subtotal"]["valor_servico"] += item_value
-                if frete_mode == "proporcional":
-                    subgroup["subtotal"]["valor_frete"] += item_frete
-                else:
-                    if pedido_id not in subgroup["_pedido_ids"]:
-                        subgroup["subtotal"]["valor_frete"] += frete_total
-                        subgroup["_pedido_ids"].add(pedido_id)
-
-                group["subtotal"]["valor_servico"] += item_value
-                if frete_mode == "proporcional":
-                    group["subtotal"]["valor_frete"] += item_frete
-                else:
-                    if pedido_id not in group["_pedido_ids"]:
-                        group["subtotal"]["valor_frete"] += frete_total
-                        group["_pedido_ids"].add(pedido_id)
-            else:
+                subgroup.rows.append(_build_row(item, pedido, item_frete, item_value))
+                subgroup.valor_servico += item_value
+                if proporcional:
+                    subgroup.valor_frete += item_frete
+                elif subgroup.mark_pedido(pedido_id):
+                    subgroup.valor_frete += frete_total
+
+                group.valor_servico += item_value
+                if proporcional:
+                    group.valor_frete += item_frete
+                elif group.mark_pedido(pedido_id):
+                    group.valor_frete += frete_total
+        elif pedido_level_group:
+            # Grupo depende só do pedido: resolve uma vez e soma os itens nele
+            group_key, group_label = _get_sintetico_group(
+                report_type,
+                pedido,
+                None,
+                normalized_date_mode,
+            )
+            group = _ensure_group(groups, group_key, group_label, use_subgroups=False)
+            if group.mark_pedido(pedido_id) and not proporcional:
+                group.valor_frete += frete_total
+            group.items_count += len(items)
+            for item_value, item_frete in zip(item_values, frete_items):
+                group.valor_servico += item_value
+                if proporcional:
+                    group.valor_frete += item_frete
+        else:
+            for item, item_value, item_frete in zip(items, item_values, frete_items):
                 group_key, group_label = _get_sintetico_group(
                     report_type,
                     pedido,
@@ -835,50 +1211,48 @@ async def relatorio_fechamentos(
                     normalized_date_mode,
                 )
                 group = _ensure_group(groups, group_key, group_label, use_subgroups=False)
-                group["_items_count"] += 1
-                group["subtotal"]["valor_servico"] += item_value
-                if frete_mode == "proporcional":
-                    group["subtotal"]["valor_frete"] += item_frete
-                else:
-                    if pedido_id not in group["_pedido_ids"]:
-                        group["subtotal"]["valor_frete"] += frete_total
-                group["_pedido_ids"].add(pedido_id)
-
-    def _finalize_subtotal(data: Dict[str, Any]) -> Dict[str, Any]:
-        frete = round(data.get("valor_frete", 0.0), 2)
-        servico = round(data.get("valor_servico", 0.0), 2)
-        subtotal = {"valor_frete": frete, "valor_servico": servico}
-        return subtotal
-
-    group_list: List[Dict[str, Any]] = list(groups.values())
-    group_list.sort(key=lambda item: _group_sort_key(item["label"]))
-
-    for group in group_list:
-        if group.get("subgroups") is not None:
-            subgroup_list = list(group["subgroups"].values())
-            subgroup_list.sort(key=lambda item: _group_sort_key(item["label"]))
-            for subgroup in subgroup_list:
-                subgroup["subtotal"] = _finalize_subtotal(subgroup["subtotal"])
-                subgroup.pop("_pedido_ids", None)
-            group["subgroups"] = subgroup_list
+                first_item = group.mark_pedido(pedido_id)
+                group.items_count += 1
+                group.valor_servico += item_value
+                if proporcional:
+                    group.valor_frete += item_frete
+                elif first_item:
+                    group.valor_frete += frete_total
+
+    def _subtotal(accum: _GroupAccum) -> Dict[str, float]:
+        # Arredonda direto dos campos do acumulador, sem dict intermediário
+        return {"valor_frete": round(accum.valor_frete, 2), "valor_servico": round(accum.valor_servico, 2)}
+
+    group_list: List[Dict[str, Any]] = []
+    for group in sorted(groups.values(), key=attrgetter("sort_key")):
+        data: Dict[str, Any] = {"key": group.key, "label": group.label}
+        if group.subgroups is not None:
+            data["rows"] = _finalize_rows(group.rows)
+            data["subgroups"] = [
+                {
+                    "key": subgroup.key,
+                    "label": subgroup.label,
+                    "rows": _finalize_rows(subgroup.rows),
+                    "subtotal": _subtotal(subgroup),
+                }
+                for subgroup in sorted(group.subgroups.values(), key=attrgetter("sort_key"))
+            ]
         else:
-            pedidos_count = len(group.get("_pedido_ids", []))
-            items_count = group.get("_items_count", 0)
-            group["rows"] = [
+            data["rows"] = [
                 {
-                    "ficha": f"Pedidos: {pedidos_count} · Itens: {items_count}",
+                    "ficha": f"Pedidos: {group.pedidos_count} · Itens: {group.items_count}",
                     "descricao": "Subtotal",
-                    "valor_frete": round(group["subtotal"]["valor_frete"], 2),
-                    "valor_servico": round(group["subtotal"]["valor_servico"], 2),
+                    "valor_frete": round(group.valor_frete, 2),
+                    "valor_servico": round(group.valor_servico, 2),
                 }
             ]
-            group.pop("subgroups", None)
+        data["subtotal"] = _subtotal(group)
+        group_list.append(data)
 
-        group["subtotal"] = _finalize_subtotal(group["subtotal"])
-        group.pop("_pedido_ids", None)
-        group.pop("_items_count", None)
-
-    total_final = _finalize_subtotal(total)
+    total_final = {
+        "valor_frete": round(total["valor_frete"], 2),
+        "valor_servico": round(total["valor_servico"], 2),
+    }
 
     response = {
         "title": REPORT_TITLES[report_type],
@@ -908,54 +1282,40 @@ async def relatorio_semanal(
         raise HTTPException(status_code=400, detail="start_date deve ser menor ou igual a end_date")
 
     normalized_date_mode = date_mode.lower().strip() if date_mode else None
-    if normalized_date_mode and normalized_date_mode not in {"entrada", "entrega", "qualquer"}:
+    if normalized_date_mode and normalized_date_mode not in _REPORT_DATE_MODES:
         raise HTTPException(status_code=400, detail="date_mode invalido")
 
     query = select(Pedido)
 
     if cliente:
-        query = query.where(func.lower(Pedido.cliente).like(f"%{cliente.lower().strip()}%"))
-
-    # Usar strings ISO diretamente para comparação léxica (YYYY-MM-DD)
-    # No SQLite, >= '2026-01-01' e < '2026-02-01' funciona corretamente para timestamps
-    start_val = start_date
-    next_day_end = (datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+        query = query.where(cliente_like_condition(cliente))
 
+    # Strings ISO: >= início e < fim + 1 dia funciona também para timestamps
     if normalized_date_mode == "entrada":
-        query = query.where(
-            Pedido.data_entrada >= start_val,
-            Pedido.data_entrada < next_day_end,
-        )
+        query = query.where(_date_range_condition(Pedido.data_entrada, start, end))
     elif normalized_date_mode == "entrega":
-        query = query.where(
-            Pedido.data_entrega >= start_val,
-            Pedido.data_entrega < next_day_end,
-        )
+        query = query.where(_date_range_condition(Pedido.data_entrega, start, end))
     else:
         query = query.where(
             or_(
-                and_(
-                    Pedido.data_entrada >= start_val,
-                    Pedido.data_entrada < next_day_end,
-                ),
-                and_(
-                    Pedido.data_entrega >= start_val,
-                    Pedido.data_entrega < next_day_end,
-                ),
+                _date_range_condition(Pedido.data_entrada, start, end),
+                _date_range_condition(Pedido.data_entrega, start, end),
             )
         )
 
-    result = await session.exec(query)
-    pedidos = result.all()
+    # Converte conforme as linhas chegam: a lista de Pedido nunca existe inteira
     response: List[PedidoResponse] = []
-    for pedido in pedidos:
+    pedidos = await session.stream_scalars(query)
+    async for pedido in pedidos:
         items = json_string_to_items(pedido.items or "[]")
         pedido_payload = pedido.model_dump()
         pedido_payload.pop("items", None)
         pedido_payload.pop("data_criacao", None)
         pedido_payload.pop("ultima_atualizacao", None)
+        # Dados já tipados pelo banco; o response_model valida a lista na saída,
+        # então construir sem validação evita validar cada pedido duas vezes
         response.append(
-            PedidoResponse(
+            PedidoResponse.model_construct(
                 **pedido_payload,
                 items=items,
                 data_criacao=pedido.data_criacao,
@@ -25,6 +25,16 @@ class RelatorioStatusResponse(SQLModel):
     cliente: Optional[str] = None
 
 
+class RelatorioResumoResponse(SQLModel):
+    total: int
+    valor_total: float
+    por_status: List[RelatorioStatusItem]
+    data_inicio: Optional[str] = None
+    data_fim: Optional[str] = None
+    date_mode: str
+    cliente: Optional[str] = None
+
+
 class RelatorioRankingItem(SQLModel):
     name: str
     pedidos: int
@@ -41,6 +51,17 @@ class RelatorioRankingResponse(SQLModel):
     status: Optional[str] = None
 
 
+class RelatorioDashboardResponse(SQLModel):
+    por_cliente: List[RelatorioRankingItem]
+    por_vendedor: List[RelatorioRankingItem]
+    por_designer: List[RelatorioRankingItem]
+    por_tipo_producao: List[RelatorioRankingItem]
+    data_inicio: Optional[str] = None
+    data_fim: Optional[str] = None
+    date_mode: str
+    status: Optional[str] = None
+
+
 class RelatorioTrendItem(SQLModel):
     period: str
     pedidos: int
@@ -1,20 +1,57 @@
-from datetime import datetime
-from typing import Optional
+from typing import Optional, get_args
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from auth.router import get_current_user
 from base import get_session
+from optimizations.cache import TTLCache
 from pedidos.schema import Pedido
-from .schema import Reposicao, ReposicaoCreate, ReposicaoUpdate, ReposicaoResponse
+from .schema import (
+    Reposicao,
+    ReposicaoCreate,
+    ReposicaoPrioridade,
+    ReposicaoResponse,
+    ReposicaoStatus,
+    ReposicaoUpdate,
+)
 
 router = APIRouter(prefix="/reposicoes", tags=["Reposicoes"])
 
-STATUS_VALIDOS = {"Pendente", "Em Processamento", "Concluída", "Cancelada"}
-PRIORIDADES_VALIDAS = {"NORMAL", "ALTA"}
+STATUS_VALIDOS = frozenset(get_args(ReposicaoStatus))
+PRIORIDADES_VALIDAS = frozenset(get_args(ReposicaoPrioridade))
+MAX_PAGE_SIZE = 500
+
+# Reposicao não tem relacionamentos carregados pela API: qualquer lazy load
+# futuro (ex.: reposicao.pedido) falha na hora em vez de virar N+1 silencioso
+_SEM_LAZY_LOAD = (raiseload("*"),)
+
+# Colunas de ReposicaoResponse, na mesma ordem: as leituras (listagem e
+# detalhe) buscam só elas e serializam as linhas direto, sem montar a
+# entidade nem revalidar a saída
+_COLUNAS_RESPOSTA = tuple(getattr(Reposicao, name) for name in ReposicaoResponse.model_fields)
+
+
+# Cache próprio do detalhe, com TTL curto. Ele vive em cada processo: o
+# PATCH/DELETE só limpa o worker que atendeu a escrita, e os demais podem
+# servir o valor antigo (ou uma reposição já apagada) por até o TTL
+DETALHE_CACHE_TTL = 2
+_detalhe_cache = TTLCache(maxsize=2048, ttl=DETALHE_CACHE_TTL)
+
+
+def _detalhe_cache_key(reposicao_id: int) -> str:
+    return f"reposicoes:detalhe:{reposicao_id}"
+
+
+async def _pedido_exists(session: AsyncSession, pedido_id: int) -> bool:
+    # Só a existência importa: não hidrata o Pedido inteiro (itens JSON etc.)
+    found = await session.scalar(select(Pedido.id).where(Pedido.id == pedido_id).limit(1))
+    return found is not None
 
 
 def _validar_status(status_value: Optional[str]) -> None:
@@ -37,26 +74,26 @@ async def create_reposicao(
     session: AsyncSession = Depends(get_session),
     _current_user: dict = Depends(get_current_user),
 ):
-    pedido = await session.get(Pedido, reposicao.order_id)
-    if not pedido:
+    if not await _pedido_exists(session, reposicao.order_id):
         raise HTTPException(status_code=404, detail="Pedido não encontrado")
 
     _validar_status(reposicao.status)
     _validar_prioridade(reposicao.prioridade)
 
-    db_reposicao = Reposicao(**reposicao.model_dump())
-    session.add(db_reposicao)
-
+    # INSERT ... RETURNING devolve a linha pronta, sem o SELECT do refresh
+    statement = insert(Reposicao).values(**reposicao.model_dump()).returning(*_COLUNAS_RESPOSTA)
     try:
-        await session.flush()
-        db_reposicao.numero = f"REP-{db_reposicao.id}"
-        db_reposicao.updated_at = datetime.utcnow()
+        result = await session.execute(statement)
+        db_reposicao = dict(result.one()._mapping)
         await session.commit()
-        await session.refresh(db_reposicao)
     except IntegrityError:
         await session.rollback()
         raise HTTPException(status_code=400, detail="Erro ao criar reposição")
 
+    # O RETURNING do SQLite não enxerga o que o trigger trg_reposicoes_numero
+    # gravou depois do INSERT; o valor é o mesmo que ele calcula
+    if db_reposicao["numero"] is None:
+        db_reposicao["numero"] = f"REP-{db_reposicao['id']}"
     return db_reposicao
 
 
@@ -64,20 +101,29 @@ async def create_reposicao(
 async def list_reposicoes(
     order_id: Optional[int] = Query(default=None),
     status_value: Optional[str] = Query(default=None, alias="status"),
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
     session: AsyncSession = Depends(get_session),
     _current_user: dict = Depends(get_current_user),
 ):
     _validar_status(status_value)
 
-    statement = select(Reposicao)
+    statement = select(*_COLUNAS_RESPOSTA)
     if order_id is not None:
         statement = statement.where(Reposicao.order_id == order_id)
     if status_value is not None:
         statement = statement.where(Reposicao.status == status_value)
 
-    statement = statement.order_by(Reposicao.created_at.desc())
+    # id desempata created_at iguais, para as páginas não repetirem/pularem linhas
+    statement = statement.order_by(Reposicao.created_at.desc(), Reposicao.id.desc())
+    if skip:
+        statement = statement.offset(skip)
+    if limit is not None:
+        statement = statement.limit(limit)
     result = await session.exec(statement)
-    return result.all()
+    # Os tipos das colunas já são os do ReposicaoResponse; retornar a Response
+    # pronta faz o FastAPI pular a validação do response_model linha a linha
+    return ORJSONResponse([dict(row._mapping) for row in result])
 
 
 @router.get("/{reposicao_id}", response_model=ReposicaoResponse)
@@ -86,10 +132,20 @@ async def get_reposicao(
     session: AsyncSession = Depends(get_session),
     _current_user: dict = Depends(get_current_user),
 ):
-    reposicao = await session.get(Reposicao, reposicao_id)
-    if not reposicao:
+    # O detalhe é relido a todo instante pelo painel: fica no cache até o
+    # PATCH/DELETE da própria reposição (neste worker) ou o TTL invalidar
+    key = _detalhe_cache_key(reposicao_id)
+    cached = _detalhe_cache.get(key)
+    if cached is not None:
+        return ORJSONResponse(cached)
+
+    statement = select(*_COLUNAS_RESPOSTA).where(Reposicao.id == reposicao_id)
+    reposicao = (await session.exec(statement)).first()
+    if reposicao is None:
         raise HTTPException(status_code=404, detail="Reposição não encontrada")
-    return reposicao
+    data = dict(reposicao._mapping)
+    _detalhe_cache.set(key, data)
+    return ORJSONResponse(data)
 
 
 @router.patch("/{reposicao_id}", response_model=ReposicaoResponse)
@@ -99,23 +155,20 @@ async def update_reposicao(
     session: AsyncSession = Depends(get_session),
     _current_user: dict = Depends(get_current_user),
 ):
-    reposicao = await session.get(Reposicao, reposicao_id)
+    reposicao = await session.get(Reposicao, reposicao_id, options=_SEM_LAZY_LOAD)
     if not reposicao:
         raise HTTPException(status_code=404, detail="Reposição não encontrada")
 
     if reposicao_update.order_id is not None:
-        pedido = await session.get(Pedido, reposicao_update.order_id)
-        if not pedido:
+        if not await _pedido_exists(session, reposicao_update.order_id):
             raise HTTPException(status_code=404, detail="Pedido não encontrado")
 
     _validar_status(reposicao_update.status)
     _validar_prioridade(reposicao_update.prioridade)
 
-    reposicao_data = reposicao_update.model_dump(exclude_unset=True)
-    for field, value in reposicao_data.items():
-        setattr(reposicao, field, value)
-
-    reposicao.updated_at = datetime.utcnow()
+    # Campos planos: copia só os enviados, sem montar o dict do model_dump
+    for field in reposicao_update.model_fields_set:
+        setattr(reposicao, field, getattr(reposicao_update, field))
 
     session.add(reposicao)
     try:
@@ -125,6 +178,7 @@ async def update_reposicao(
         await session.rollback()
         raise HTTPException(status_code=400, detail="Erro ao atualizar reposição")
 
+    _detalhe_cache.delete(_detalhe_cache_key(reposicao_id))
     return reposicao
 
 
@@ -134,10 +188,11 @@ async def delete_reposicao(
     session: AsyncSession = Depends(get_session),
     _current_user: dict = Depends(get_current_user),
 ):
-    reposicao = await session.get(Reposicao, reposicao_id)
+    reposicao = await session.get(Reposicao, reposicao_id, options=_SEM_LAZY_LOAD)
     if not reposicao:
         raise HTTPException(status_code=404, detail="Reposição não encontrada")
 
     await session.delete(reposicao)
     await session.commit()
+    _detalhe_cache.delete(_detalhe_cache_key(reposicao_id))
     return {"message": "Reposição excluída com sucesso"}
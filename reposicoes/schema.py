@@ -1,9 +1,16 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import Literal, Optional
 
+from sqlalchemy import DDL, Column, DateTime, Index, event, func
 from sqlmodel import Field, SQLModel
 
 
+# Valores aceitos pela API. Os campos continuam str: o router valida e responde
+# 400 (contrato dos clientes), em vez do 422 que um Literal no modelo geraria
+ReposicaoStatus = Literal["Pendente", "Em Processamento", "Concluída", "Cancelada"]
+ReposicaoPrioridade = Literal["NORMAL", "ALTA"]
+
+
 class ReposicaoBase(SQLModel):
     order_id: int = Field(foreign_key="pedidos.id", index=True)
     motivo: str
@@ -23,11 +30,44 @@ class ReposicaoBase(SQLModel):
 
 class Reposicao(ReposicaoBase, table=True):
     __tablename__ = "reposicoes"
+    __table_args__ = (
+        # Listagem filtra por pedido/status e ordena por created_at DESC
+        Index("ix_reposicoes_order_status_created", "order_id", "status", "created_at"),
+        Index("ix_reposicoes_created_at", "created_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     numero: Optional[str] = Field(default=None, index=True, unique=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Carimbados pelo banco (CURRENT_TIMESTAMP, UTC) no INSERT/UPDATE; o default
+    # vai no próprio SQL, então vale também para tabelas criadas sem DEFAULT
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime, nullable=False, default=func.now(), server_default=func.now()),
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(
+            DateTime,
+            nullable=False,
+            default=func.now(),
+            server_default=func.now(),
+            onupdate=func.now(),
+        ),
+    )
+
+
+# O número "REP-<id>" é gravado pelo próprio banco logo após o INSERT, sem
+# flush + UPDATE a partir do Python. Preso ao after_create do metadata (e não
+# da tabela) para que bancos já existentes também ganhem o trigger no startup.
+event.listen(
+    SQLModel.metadata,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS trg_reposicoes_numero "
+        "AFTER INSERT ON reposicoes WHEN NEW.numero IS NULL "
+        "BEGIN UPDATE reposicoes SET numero = 'REP-' || NEW.id WHERE id = NEW.id; END"
+    ).execute_if(dialect="sqlite"),
+)
 
 
 class ReposicaoCreate(ReposicaoBase):
@@ -6,23 +6,23 @@ Execute ANTES de fazer o deploy do novo backend para preservar dados existentes.
 Uso:
     python scripts/backup_before_deploy.py
 """
-import asyncio
-import shutil
+import sys
 from pathlib import Path
 from datetime import datetime
-from config import settings
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-async def backup_before_deploy():
+from scripts.backup_database import sqlite_backup
+from scripts.db_utils import resolve_sqlite_path
+
+
+def backup_before_deploy():
     """Faz backup do banco de dados antes do deploy."""
     # Resolver caminho do banco
-    db_url = settings.DATABASE_URL
-    if db_url.startswith("sqlite:///"):
-        db_path = Path(db_url.replace("sqlite:///", ""))
-    elif db_url.startswith("sqlite://"):
-        db_path = Path(db_url.replace("sqlite://", ""))
-    else:
-        print(f"❌ URL do banco não é SQLite: {db_url}")
+    try:
+        db_path = resolve_sqlite_path()
+    except RuntimeError as e:
+        print(f"❌ {e}")
         return None
     
     if not db_path.exists():
@@ -39,9 +39,9 @@ async def backup_before_deploy():
     backup_name = f"{db_path.stem}_backup_{timestamp}.db"
     backup_path = backup_dir / backup_name
     
-    # Copiar banco
+    # API de backup do SQLite: cópia consistente mesmo com a API gravando (WAL)
     try:
-        shutil.copy2(db_path, backup_path)
+        sqlite_backup(db_path, backup_path)
         size_mb = backup_path.stat().st_size / 1024 / 1024
         
         print(f"✅ Backup criado com sucesso!")
@@ -57,5 +57,5 @@ async def backup_before_deploy():
 
 
 if __name__ == "__main__":
-    asyncio.run(backup_before_deploy())
+    backup_before_deploy()
 
@@ -49,8 +49,9 @@ Write-Host ""
 python scripts/build_exe.py $Version
 
 if ($LASTEXITCODE -eq 0) {
-    $exeName = "api_sgp_$($Version.Replace('.', '_')).exe"
-    $exePath = "dist\$exeName"
+    $distName = "api_sgp_$($Version.Replace('.', '_'))"
+    $exeName = "$distName.exe"
+    $exePath = "dist\$distName\$exeName"
     
     if (Test-Path $exePath) {
         $fileSize = [math]::Round((Get-Item $exePath).Length / 1MB, 2)
@@ -60,7 +61,7 @@ if ($LASTEXITCODE -eq 0) {
         Write-Host "  Tamanho: $fileSize MB" -ForegroundColor Green
         Write-Host ""
         Write-Host "[INFO] Próximos passos:" -ForegroundColor Cyan
-        Write-Host "  1. Copie o executável para o servidor Windows" -ForegroundColor Cyan
+        Write-Host "  1. Copie a pasta dist\$distName inteira para o servidor Windows" -ForegroundColor Cyan
         Write-Host "  2. Crie os diretórios: db, media, logs, backups" -ForegroundColor Cyan
         Write-Host "  3. Configure o NSSM para usar o executável" -ForegroundColor Cyan
         Write-Host ""
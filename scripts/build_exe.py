@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 """
 Script para criar executável da API usando PyInstaller.
-Gera um único arquivo .exe que contém toda a aplicação Python.
+Gera uma pasta com o .exe e as dependências já descompactadas (--onedir):
+o startup não precisa extrair a aplicação para um diretório temporário.
 
 Uso:
     python scripts/build_exe.py [versão]
     
 Exemplo:
     python scripts/build_exe.py 0.1
-    # Cria: dist/api_sgp_0_1.exe
+    # Cria: dist/api_sgp_0_1/api_sgp_0_1.exe
 """
 import subprocess
 import sys
@@ -52,7 +53,7 @@ def build_exe(version: str = "0.1"):
     cmd = [
         "pyinstaller",
         "--name", exe_name,
-        "--onefile",  # Um único arquivo .exe
+        "--onedir",  # Pasta com o .exe: sem extração a cada inicialização
         "--console",  # Mostrar console (útil para logs)
         "--clean",  # Limpar cache antes de build
         *add_data_args,
@@ -78,29 +79,30 @@ def build_exe(version: str = "0.1"):
     
     print(f"🔨 Criando executável: {exe_name}.exe")
     print(f"   Versão: {version}")
-    print(f"   Comando: pyinstaller --name {exe_name} --onefile --console ...")
+    print(f"   Comando: pyinstaller --name {exe_name} --onedir --console ...")
     print()
     
     try:
         result = subprocess.run(cmd, check=True, capture_output=False)
         
         if result.returncode == 0:
-            exe_path = Path("dist") / f"{exe_name}.exe"
+            dist_dir = Path("dist") / exe_name
+            exe_path = dist_dir / f"{exe_name}.exe"
             if exe_path.exists():
-                size_mb = exe_path.stat().st_size / 1024 / 1024
+                size_mb = sum(f.stat().st_size for f in dist_dir.rglob("*") if f.is_file()) / 1024 / 1024
                 print()
                 print(f"✅ Executável criado com sucesso!")
                 print(f"   Arquivo: {exe_path}")
-                print(f"   Tamanho: {size_mb:.2f} MB")
+                print(f"   Tamanho da pasta: {size_mb:.2f} MB")
                 print()
                 print(f"💡 Próximos passos:")
-                print(f"   1. Copie o executável para o servidor")
+                print(f"   1. Copie a pasta {dist_dir} inteira para o servidor")
                 print(f"   2. Crie os diretórios: db, media, logs, backups")
                 print(f"   3. Configure o NSSM para usar o executável")
                 return exe_path
             else:
                 print(f"⚠️  Executável não encontrado em: {exe_path}")
-                print(f"   Verifique a pasta dist/")
+                print(f"   Verifique a pasta {dist_dir}/")
                 return None
     except subprocess.CalledProcessError as e:
         print(f"❌ Erro ao criar executável: {e}")
@@ -23,18 +23,34 @@ def cleanup():
         # Geralmente item_id NULL é log de pedido inteiro ou erro genérico.
         # Vamos agrupar por pedido_id e item_id, mas apenas para registros onde item_id não é NULL.
         
+        # ROW_NUMBER por (pedido_id, item_id): fica só a linha de maior id de
+        # cada grupo. O índice deixa a partição/ordenação vir pronta dele; ele
+        # é só desta limpeza (não está no modelo nem nas migrations) e é
+        # removido na mesma transação.
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_print_logs_dedup "
+            "ON print_logs(pedido_id, COALESCE(item_id, -1), id)"
+        )
         query = """
-        DELETE FROM print_logs 
-        WHERE id NOT IN (
-            SELECT MAX(id) 
-            FROM print_logs 
-            GROUP BY pedido_id, COALESCE(item_id, -1)
+        DELETE FROM print_logs
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY pedido_id, COALESCE(item_id, -1)
+                    ORDER BY id DESC
+                ) AS rn
+                FROM print_logs
+            )
+            WHERE rn > 1
         );
         """
         
         cursor.execute(query)
         deleted = cursor.rowcount
+        cursor.execute("DROP INDEX IF EXISTS ix_print_logs_dedup")
         conn.commit()
+        cursor.execute("ANALYZE print_logs")
         
         # Contar depois
         cursor.execute("SELECT COUNT(*) FROM print_logs")
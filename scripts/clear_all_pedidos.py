@@ -10,6 +10,7 @@ Uso:
 
 import argparse
 import asyncio
+import os
 import sys
 import shutil
 from pathlib import Path
@@ -18,7 +19,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from database.database import async_session_maker
-from sqlmodel import select, delete
+from sqlmodel import select, delete, func
 from pedidos.schema import Pedido, PedidoImagem
 from pedidos.images import delete_media_file, MEDIA_ROOT, PEDIDOS_MEDIA_ROOT
 
@@ -27,10 +28,8 @@ async def clear_all_pedidos(clean_media: bool = True):
     """Esvazia todos os pedidos do banco e opcionalmente limpa arquivos de mídia."""
     async with async_session_maker() as session:
         try:
-            # Contar pedidos antes de deletar
-            result = await session.exec(select(Pedido))
-            all_pedidos = list(result.all())
-            total_pedidos = len(all_pedidos)
+            # Contar pedidos antes de deletar (sem carregar as linhas)
+            total_pedidos = (await session.exec(select(func.count()).select_from(Pedido))).one()
             
             if total_pedidos == 0:
                 print("✅ Nenhum pedido encontrado no banco de dados.")
@@ -38,18 +37,20 @@ async def clear_all_pedidos(clean_media: bool = True):
                 print(f"📋 Encontrados {total_pedidos} pedidos para deletar...")
                 
                 # Deletar imagens associadas aos pedidos (PedidoImagem)
-                images_result = await session.exec(select(PedidoImagem))
-                all_images = list(images_result.all())
-                total_images = len(all_images)
+                image_paths = list((await session.exec(select(PedidoImagem.path))).all())
+                total_images = len(image_paths)
                 
                 if total_images > 0:
                     print(f"🗑️  Deletando {total_images} registros de imagens...")
-                    for image in all_images:
-                        try:
-                            await delete_media_file(image.path)
-                        except Exception as e:
-                            print(f"   ⚠️  Erro ao deletar arquivo {image.path}: {e}")
-                        await session.delete(image)
+                    results = await asyncio.gather(
+                        *(delete_media_file(path) for path in image_paths),
+                        return_exceptions=True,
+                    )
+                    for path, result in zip(image_paths, results):
+                        if isinstance(result, Exception):
+                            print(f"   ⚠️  Erro ao deletar arquivo {path}: {result}")
+                    # Um único DELETE em vez de um por registro
+                    await session.exec(delete(PedidoImagem))
                 
                 # Deletar todos os pedidos (os itens serão deletados em cascata)
                 print(f"🗑️  Deletando {total_pedidos} pedidos...")
@@ -68,16 +69,17 @@ async def clear_all_pedidos(clean_media: bool = True):
                 # Limpar diretório tmp (imagens temporárias)
                 tmp_dir = PEDIDOS_MEDIA_ROOT / "tmp"
                 if tmp_dir.exists():
-                    tmp_files = list(tmp_dir.glob("*"))
-                    tmp_count = len([f for f in tmp_files if f.is_file()])
+                    # scandir: o tipo de cada entrada vem da própria listagem, sem stat extra
+                    with os.scandir(tmp_dir) as entries:
+                        tmp_files = [entry for entry in entries if entry.is_file()]
+                    tmp_count = len(tmp_files)
                     if tmp_count > 0:
                         print(f"   🗑️  Removendo {tmp_count} arquivo(s) de pedidos/tmp/...")
-                        for file_path in tmp_files:
-                            if file_path.is_file():
-                                try:
-                                    file_path.unlink()
-                                except Exception as e:
-                                    print(f"      ⚠️  Erro ao deletar {file_path.name}: {e}")
+                        for entry in tmp_files:
+                            try:
+                                os.unlink(entry.path)
+                            except Exception as e:
+                                print(f"      ⚠️  Erro ao deletar {entry.name}: {e}")
                         print(f"   ✅ Diretório tmp limpo!")
                     else:
                         print(f"   ✅ Diretório tmp já está vazio")
@@ -85,14 +87,18 @@ async def clear_all_pedidos(clean_media: bool = True):
                 # Limpar diretórios de pedidos individuais (pedidos/{id}/)
                 pedidos_dir = PEDIDOS_MEDIA_ROOT
                 if pedidos_dir.exists():
-                    pedido_dirs = [d for d in pedidos_dir.iterdir() if d.is_dir() and d.name.isdigit()]
+                    with os.scandir(pedidos_dir) as entries:
+                        pedido_dirs = [entry for entry in entries if entry.name.isdigit() and entry.is_dir()]
                     if pedido_dirs:
                         print(f"   🗑️  Removendo {len(pedido_dirs)} diretório(s) de pedidos...")
-                        for pedido_dir in pedido_dirs:
-                            try:
-                                shutil.rmtree(pedido_dir)
-                            except Exception as e:
-                                print(f"      ⚠️  Erro ao deletar {pedido_dir.name}: {e}")
+                        # rmtree é bloqueante: cada diretório em uma thread, em paralelo
+                        results = await asyncio.gather(
+                            *(asyncio.to_thread(shutil.rmtree, pedido_dir.path) for pedido_dir in pedido_dirs),
+                            return_exceptions=True,
+                        )
+                        for pedido_dir, result in zip(pedido_dirs, results):
+                            if isinstance(result, Exception):
+                                print(f"      ⚠️  Erro ao deletar {pedido_dir.name}: {result}")
                         print(f"   ✅ Diretórios de pedidos limpos!")
                     else:
                         print(f"   ✅ Nenhum diretório de pedido encontrado")
@@ -3,6 +3,7 @@ Utilidades compartilhadas para scripts administrativos do banco de dados.
 """
 from __future__ import annotations
 
+import sqlite3
 from pathlib import Path
 from typing import Final
 
@@ -37,3 +38,18 @@ def resolve_sqlite_path() -> Path:
         path = PROJECT_ROOT / path
 
     return path
+
+
+def connect_sqlite(path: Path) -> sqlite3.Connection:
+    """
+    Abre uma conexão sqlite3 com os mesmos PRAGMAs de performance da API
+    (ver database/database.py), para os scripts que acessam o banco direto.
+    """
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA busy_timeout=10000")
+    connection.execute("PRAGMA cache_size=-64000")
+    connection.execute("PRAGMA temp_store=MEMORY")
+    connection.execute("PRAGMA mmap_size=268435456")
+    return connection
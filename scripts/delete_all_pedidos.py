@@ -11,45 +11,105 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from database.database import async_session_maker
-from sqlmodel import select
+from sqlmodel import select, delete, func
 from pedidos.schema import Pedido, PedidoImagem
-from pedidos.images import delete_media_file
+from pedidos.images import ImageDecodingError, absolute_media_path
+from reposicoes.schema import Reposicao
+from maquinas.print_log_schema import PrintLog
+
+
+# Pedidos por transação: memória limitada a um lote de ids/caminhos e o lock de
+# escrita é liberado entre os lotes (a API continua gravando durante a limpeza)
+DELETE_BATCH_SIZE = 1000
+
+
+def _unlink_media_file(relative_path: str) -> None:
+    """Remove um arquivo de mídia (mesmas regras de delete_media_file), de forma bloqueante."""
+    try:
+        absolute_media_path(relative_path).unlink(missing_ok=True)
+    except (ImageDecodingError, OSError):
+        # Caminho inválido, arquivo já deletado ou bloqueado
+        pass
+
+
+async def _unlink_media_files(image_paths) -> None:
+    # delete_media_file faz o unlink dentro da própria corrotina, então
+    # um gather com ela roda em série; em threads os unlinks se sobrepõem
+    await asyncio.gather(
+        *(asyncio.to_thread(_unlink_media_file, path) for path in image_paths if path)
+    )
+
+
+async def _delete_images(session, *criteria) -> list:
+    """Apaga os registros de PedidoImagem (com os filtros dados) e retorna os caminhos."""
+    image_paths = list((await session.exec(select(PedidoImagem.path).where(*criteria))).all())
+    if image_paths:
+        await session.exec(
+            delete(PedidoImagem).where(*criteria).execution_options(synchronize_session=False)
+        )
+    return image_paths
+
+
+async def _delete_related(session, pedido_ids) -> None:
+    """
+    Apaga reposições e logs de impressão dos pedidos. Pedido não tem
+    relacionamentos no ORM e o SQLite roda sem foreign_keys, então não há
+    cascata: sem isso as linhas ficariam órfãs.
+    """
+    for model, pedido_column in ((Reposicao, Reposicao.order_id), (PrintLog, PrintLog.pedido_id)):
+        await session.exec(
+            delete(model).where(pedido_column.in_(pedido_ids)).execution_options(synchronize_session=False)
+        )
 
 
 async def delete_all_pedidos():
     """Deleta todos os pedidos e suas imagens."""
     async with async_session_maker() as session:
         try:
-            # Buscar todos os pedidos
-            result = await session.exec(select(Pedido))
-            all_pedidos = result.all()
+            # Contar pedidos antes de deletar (sem carregar as linhas)
+            total_pedidos = (await session.exec(select(func.count()).select_from(Pedido))).one()
             
-            if not all_pedidos:
+            if total_pedidos == 0:
                 print("✅ Nenhum pedido encontrado para deletar.")
                 return
             
-            print(f"📋 Encontrados {len(all_pedidos)} pedidos para deletar...")
+            print(f"📋 Encontrados {total_pedidos} pedidos para deletar...")
             
-            # Deletar imagens de todos os pedidos
+            # Lotes de ids: cada lote apaga imagens, reposições, logs de impressão
+            # e pedidos (os itens ficam no JSON do próprio pedido) em DELETEs em
+            # massa e faz seu próprio commit. Nada é carregado na sessão, então
+            # não há identity map a sincronizar
             total_images = 0
-            for pedido in all_pedidos:
-                images_result = await session.exec(
-                    select(PedidoImagem).where(PedidoImagem.pedido_id == pedido.id)
-                )
-                for image in images_result.all():
-                    await delete_media_file(image.path)
-                    await session.delete(image)
-                    total_images += 1
+            unlink_pendente = None
+            while True:
+                pedido_ids = list((await session.exec(
+                    select(Pedido.id).order_by(Pedido.id).limit(DELETE_BATCH_SIZE)
+                )).all())
+                if not pedido_ids:
+                    # Imagens órfãs (sem pedido) também são removidas
+                    image_paths = await _delete_images(session)
+                else:
+                    image_paths = await _delete_images(session, PedidoImagem.pedido_id.in_(pedido_ids))
+                    await _delete_related(session, pedido_ids)
+                    await session.exec(
+                        delete(Pedido).where(Pedido.id.in_(pedido_ids)).execution_options(synchronize_session=False)
+                    )
+                await session.commit()
+                total_images += len(image_paths)
+                
+                # Arquivos só são removidos depois que o banco confirmou a exclusão;
+                # os unlinks de um lote correm enquanto o próximo é apagado no banco
+                if unlink_pendente is not None:
+                    await unlink_pendente
+                unlink_pendente = asyncio.create_task(_unlink_media_files(image_paths))
+                if not pedido_ids:
+                    break
+            await unlink_pendente
             
             if total_images > 0:
                 print(f"🗑️  {total_images} imagens deletadas.")
             
-            # Deletar todos os pedidos (os itens serão deletados em cascata)
-            for pedido in all_pedidos:
-                await session.delete(pedido)
-            
-            await session.commit()
-            print(f"✅ {len(all_pedidos)} pedidos deletados com sucesso!")
+            print(f"✅ {total_pedidos} pedidos deletados com sucesso!")
             
         except Exception as e:
             await session.rollback()
@@ -57,7 +57,7 @@
     .\deploy.ps1 -ProjectPath "C:\SGP\api-sgp" -Workers 2 -UseHypercorn $false
 
 .EXAMPLE
-    .\deploy.ps1 -UseExe -ExePath "C:\SGP\api_sgp_0_1.exe" -Port 8000
+    .\deploy.ps1 -UseExe -ExePath "C:\SGP\api_sgp_0_1\api_sgp_0_1.exe" -Port 8000
 #>
 param(
     [Parameter()][string]$ProjectPath = (Get-Location).Path,
@@ -3,12 +3,19 @@
 Script de diagnóstico para verificar valores dos pedidos de uma data específica.
 """
 
-import sqlite3
+import io
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.db_utils import connect_sqlite
+
 # Função normalize_float_value standalone
+# Muitos pedidos repetem os mesmos valores (frete "0.00", preços de tabela)
+@lru_cache(maxsize=4096)
 def normalize_float_value(value):
     """Normaliza valores de string para float."""
     if value is None or value == '':
@@ -19,6 +26,12 @@ def normalize_float_value(value):
     if not value_str or value_str == 'None':
         return 0.0
     
+    # Caminho rápido para o formato canônico ("1955.00" ou "1955"), o mais comum
+    if value_str.isdecimal() or (
+        value_str[-3:-2] == '.' and value_str[:-3].isdecimal() and value_str[-2:].isdecimal()
+    ):
+        return float(value_str)
+    
     # Detecta formato e converte corretamente
     if ',' in value_str and '.' in value_str:
         # Verificar ordem: se vírgula vem depois do ponto, é formato brasileiro
@@ -67,10 +80,19 @@ def get_db_path():
     raise FileNotFoundError(f"Banco de dados não encontrado")
 
 
+def _prefix_upper_bound(prefix: str) -> str:
+    """Menor string maior que todas as que começam com prefix (limite exclusivo do intervalo)."""
+    if not prefix:
+        return chr(0x10FFFF)
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
 def diagnosticar_data(data: str):
     """Diagnostica os valores dos pedidos de uma data específica."""
     db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
+    conn = connect_sqlite(db_path)
+    # Mesmo índice declarado no modelo (Field(index=True)); no-op em bancos já migrados
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_pedidos_data_entrada ON pedidos(data_entrada)")
     
     print(f"\n{'='*60}")
     print(f"DIAGNOSTICO DE VALORES - Data: {data}")
@@ -81,35 +103,46 @@ def diagnosticar_data(data: str):
     datas_existentes = [row[0] for row in cursor_check.fetchall()]
     print(f"Ultimas 10 datas no banco: {datas_existentes}\n")
     
-    # Buscar pedidos da data (tentar com e sem timestamp)
+    # Buscar pedidos da data (com e sem timestamp): o prefixo vira um intervalo
+    # [data, limite) que o SQLite resolve pelo índice, ao contrário do LIKE
+    intervalo = (data, _prefix_upper_bound(data))
     query = """
         SELECT 
             id, numero, data_entrada, cliente,
             valor_total, valor_frete, valor_itens
         FROM pedidos
-        WHERE data_entrada LIKE ?
+        WHERE data_entrada >= ? AND data_entrada < ?
         ORDER BY id
     """
     
-    cursor = conn.execute(query, (f"{data}%",))
-    rows = cursor.fetchall()
+    # A contagem vem do índice; as linhas são consumidas direto do cursor,
+    # sem materializar a lista inteira
+    total_pedidos = conn.execute(
+        "SELECT COUNT(*) FROM pedidos WHERE data_entrada >= ? AND data_entrada < ?", intervalo
+    ).fetchone()[0]
     
-    if not rows:
+    if not total_pedidos:
         print(f"[ERRO] Nenhum pedido encontrado para a data {data}")
         conn.close()
         return
     
-    print(f"Total de pedidos encontrados: {len(rows)}\n")
+    print(f"Total de pedidos encontrados: {total_pedidos}\n")
     
-    # Calcular totais
+    # Totais, inconsistências e soma consistente saem da mesma passada que
+    # imprime a listagem (cada linha é normalizada uma única vez)
     total_soma_valor_total = 0.0
     total_soma_frete = 0.0
     total_soma_itens = 0.0
+    problemas = []
+    soma_consistente = 0.0
     
     print(f"{'ID':<6} {'Número':<12} {'Cliente':<30} {'Valor Total':<15} {'Frete':<12} {'Itens':<12} {'Total Normalizado':<18}")
     print("-" * 110)
     
-    for row in rows:
+    # Linhas da listagem vão para um buffer e saem em uma única escrita no
+    # stdout, em vez de um print (e um write no terminal) por pedido
+    listagem = io.StringIO()
+    for row in conn.execute(query, intervalo):
         pedido_id, numero, data_entrada, cliente, valor_total, valor_frete, valor_itens = row
         
         # Normalizar valores
@@ -122,13 +155,33 @@ def diagnosticar_data(data: str):
         total_soma_frete += frete_norm
         total_soma_itens += itens_norm
         
+        calculado = frete_norm + itens_norm
+        diferenca = abs(total_norm - calculado)
+        
+        # Verificar se valor_total está muito diferente de frete + itens
+        if valor_total and valor_frete and valor_itens and diferenca > 0.01:  # Diferença maior que 1 centavo
+            problemas.append({
+                'id': pedido_id,
+                'numero': numero,
+                'valor_total': total_norm,
+                'frete': frete_norm,
+                'itens': itens_norm,
+                'calculado': calculado,
+                'diferenca': diferenca
+            })
+        
+        # Se valor_total está consistente com frete + itens (ou se não tem frete/itens, usar valor_total)
+        if diferenca < 0.01 or (frete_norm == 0 and itens_norm == 0):
+            soma_consistente += total_norm
+        
         # Truncar cliente se muito longo
         cliente_display = cliente[:28] + ".." if len(cliente) > 30 else cliente
         
-        print(f"{pedido_id:<6} {numero or 'N/A':<12} {cliente_display:<30} "
-              f"{valor_total or '0.00':<15} {valor_frete or '0.00':<12} "
-              f"{valor_itens or '0.00':<12} {total_norm:<18.2f}")
+        listagem.write(f"{pedido_id:<6} {numero or 'N/A':<12} {cliente_display:<30} "
+                       f"{valor_total or '0.00':<15} {valor_frete or '0.00':<12} "
+                       f"{valor_itens or '0.00':<12} {total_norm:<18.2f}\n")
     
+    sys.stdout.write(listagem.getvalue())
     print("-" * 110)
     print(f"\n{'RESUMO':<30} {'Valor Bruto':<20} {'Valor Normalizado':<20}")
     print("-" * 70)
@@ -144,23 +197,28 @@ def diagnosticar_data(data: str):
     print(f"{'='*60}\n")
     
     # Verificar IDs duplicados
-    ids = [row[0] for row in rows]
-    ids_unicos = set(ids)
-    if len(ids) != len(ids_unicos):
+    # Duplicatas agrupadas pelo próprio SQLite: só os valores repetidos voltam
+    # (ordem da primeira ocorrência, como na listagem)
+    duplicados = [row[0] for row in conn.execute(
+        "SELECT id FROM pedidos WHERE data_entrada >= ? AND data_entrada < ? "
+        "GROUP BY id HAVING COUNT(*) > 1 ORDER BY MIN(id)",
+        intervalo,
+    )]
+    if duplicados:
         print(f"[ATENCAO] Ha IDs duplicados!")
-        from collections import Counter
-        duplicados = [id for id, count in Counter(ids).items() if count > 1]
         print(f"   IDs duplicados: {duplicados}")
     else:
         print("[OK] Nenhum ID duplicado encontrado")
     
     # Verificar números duplicados
-    numeros = [row[1] for row in rows if row[1]]
-    numeros_unicos = set(numeros)
-    if len(numeros) != len(numeros_unicos):
+    duplicados = [row[0] for row in conn.execute(
+        "SELECT numero FROM pedidos WHERE data_entrada >= ? AND data_entrada < ? "
+        "AND numero IS NOT NULL AND numero != '' "
+        "GROUP BY numero HAVING COUNT(*) > 1 ORDER BY MIN(id)",
+        intervalo,
+    )]
+    if duplicados:
         print(f"[ATENCAO] Ha numeros de pedido duplicados!")
-        from collections import Counter
-        duplicados = [num for num, count in Counter(numeros).items() if count > 1]
         print(f"   Números duplicados: {duplicados}")
     else:
         print("[OK] Nenhum numero de pedido duplicado encontrado")
@@ -170,28 +228,6 @@ def diagnosticar_data(data: str):
     print("VALORES PROBLEMÁTICOS")
     print(f"{'='*60}\n")
     
-    problemas = []
-    for row in rows:
-        pedido_id, numero, data_entrada, cliente, valor_total, valor_frete, valor_itens = row
-        total_norm = normalize_float_value(valor_total)
-        frete_norm = normalize_float_value(valor_frete)
-        itens_norm = normalize_float_value(valor_itens)
-        
-        # Verificar se valor_total está muito diferente de frete + itens
-        if valor_total and valor_frete and valor_itens:
-            total_calculado = frete_norm + itens_norm
-            diferenca = abs(total_norm - total_calculado)
-            if diferenca > 0.01:  # Diferença maior que 1 centavo
-                problemas.append({
-                    'id': pedido_id,
-                    'numero': numero,
-                    'valor_total': total_norm,
-                    'frete': frete_norm,
-                    'itens': itens_norm,
-                    'calculado': total_calculado,
-                    'diferenca': diferenca
-                })
-    
     if problemas:
         print(f"[ATENCAO] Encontrados {len(problemas)} pedidos com valores inconsistentes:\n")
         for p in problemas:
@@ -209,20 +245,6 @@ def diagnosticar_data(data: str):
     print(f"  Soma dos valor_total normalizados = R$ {total_soma_valor_total:.2f}")
     print(f"  Soma dos (frete + itens) = R$ {total_soma_frete + total_soma_itens:.2f}")
     print(f"  Se usar apenas pedidos com valor_total = frete + itens: ", end="")
-    
-    # Calcular apenas pedidos onde valor_total = frete + itens (dentro de 0.01 de tolerância)
-    soma_consistente = 0.0
-    for row in rows:
-        pedido_id, numero, data_entrada, cliente, valor_total, valor_frete, valor_itens = row
-        total_norm = normalize_float_value(valor_total)
-        frete_norm = normalize_float_value(valor_frete)
-        itens_norm = normalize_float_value(valor_itens)
-        calculado = frete_norm + itens_norm
-        
-        # Se valor_total está consistente com frete + itens (ou se não tem frete/itens, usar valor_total)
-        if abs(total_norm - calculado) < 0.01 or (frete_norm == 0 and itens_norm == 0):
-            soma_consistente += total_norm
-    
     print(f"R$ {soma_consistente:.2f}")
     print(f"{'='*60}\n")
 
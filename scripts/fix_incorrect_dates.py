@@ -4,14 +4,43 @@ Script opcional para corrigir datas de entrega incorretas no banco de dados
 baseado nos arquivos JSON originais.
 """
 import json
-import sqlite3
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
 
+import orjson
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.db_utils import connect_sqlite
+
 MEDIA_PEDIDOS = PROJECT_ROOT / "media" / "pedidos"
 DB_PATH = PROJECT_ROOT / "db" / "banco.db"
 
+# Leituras de JSON em paralelo: o gargalo é I/O de disco, não CPU
+JSON_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _load_pedido_json(path):
+    """Lê id e data_entrega de um JSON de pedido; None se o arquivo for inválido."""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # json aceita o que o orjson recusa (NaN, inteiros enormes)
+            data = json.loads(raw.decode('utf-8'))
+        return {
+            'id': data.get('id'),
+            'data_entrega': data.get('data_entrega')
+        }
+    except Exception:
+        return None
+
+
 def fix_incorrect_dates(dry_run=True):
     """Corrige datas de entrega incorretas baseado nos JSONs."""
     if not DB_PATH.exists():
@@ -21,58 +50,62 @@ def fix_incorrect_dates(dry_run=True):
     print("🔧 Script de correção de datas")
     print(f"Modo: {'SIMULAÇÃO (dry-run)' if dry_run else 'EXECUÇÃO REAL'}\n")
     
-    # Buscar todos os pedidos dos JSONs
-    pedidos_json = {}
-    for pedido_dir in MEDIA_PEDIDOS.iterdir():
-        if not pedido_dir.is_dir() or pedido_dir.name == "tmp":
-            continue
-        
-        try:
-            pedido_id = int(pedido_dir.name)
-        except ValueError:
-            continue
-        
-        json_files = list(pedido_dir.glob("pedido-*.json"))
-        if not json_files:
-            continue
-        
-        json_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-        latest_json = json_files[0]
-        
-        try:
-            with open(latest_json, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                pedidos_json[pedido_id] = {
-                    'id': data.get('id'),
-                    'data_entrega': data.get('data_entrega')
-                }
-        except Exception:
-            continue
-    
     # Conectar ao banco
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_sqlite(DB_PATH)
     cursor = conn.cursor()
     
     try:
+        # Datas atuais de todos os pedidos em uma única consulta. Só pedidos que
+        # existem e têm data_entrega podem ser corrigidos: os JSONs dos demais
+        # nem são procurados/lidos
+        cursor.execute(
+            "SELECT id, substr(data_entrega, 1, 10) FROM pedidos "
+            "WHERE data_entrega IS NOT NULL AND data_entrega != ''"
+        )
+        datas_banco = dict(cursor.fetchall())
+        
+        # Buscar os pedidos dos JSONs
+        # scandir: tipo e mtime vêm das entradas da listagem (stat em cache), e o
+        # JSON mais recente sai de uma única passada, sem ordenar a lista
+        latest_jsons = []
+        with os.scandir(MEDIA_PEDIDOS) as pedido_dirs:
+            for pedido_dir in pedido_dirs:
+                if pedido_dir.name == "tmp" or not pedido_dir.is_dir():
+                    continue
+                
+                try:
+                    pedido_id = int(pedido_dir.name)
+                except ValueError:
+                    continue
+                if pedido_id not in datas_banco:
+                    continue
+                
+                latest_json = None
+                latest_mtime = None
+                with os.scandir(pedido_dir.path) as entries:
+                    for entry in entries:
+                        if not (entry.name.startswith("pedido-") and entry.name.endswith(".json")):
+                            continue
+                        mtime = entry.stat().st_mtime
+                        if latest_mtime is None or mtime > latest_mtime:
+                            latest_json, latest_mtime = entry.path, mtime
+                if latest_json is not None:
+                    latest_jsons.append((pedido_id, latest_json))
+        
+        # Vários arquivos em leitura ao mesmo tempo, em vez de um open/read por vez
+        with ThreadPoolExecutor(max_workers=JSON_READ_WORKERS) as executor:
+            loaded = executor.map(_load_pedido_json, [path for _, path in latest_jsons])
+            pedidos_json = {
+                pedido_id: pedido_json
+                for (pedido_id, _), pedido_json in zip(latest_jsons, loaded)
+                if pedido_json is not None
+            }
+        
         # Buscar pedidos com datas diferentes
         correcoes = []
         for pedido_id, pedido_json in pedidos_json.items():
             json_data = (pedido_json.get('data_entrega') or '')[:10]
-            if not json_data:
-                continue
-            
-            # Buscar data atual no banco
-            cursor.execute(
-                "SELECT id, data_entrega FROM pedidos WHERE id = ?",
-                (pedido_id,)
-            )
-            row = cursor.fetchone()
-            
-            if not row:
-                continue
-            
-            db_id, db_data = row
-            db_data_only = (db_data or '')[:10] if db_data else ''
+            db_data_only = datas_banco[pedido_id]
             
             if json_data != db_data_only and json_data and db_data_only:
                 correcoes.append({
@@ -88,14 +121,21 @@ def fix_incorrect_dates(dry_run=True):
         print(f"📋 Encontradas {len(correcoes)} datas que precisam ser corrigidas:\n")
         print("-" * 80)
         
+        if not dry_run:
+            # Uma única transação de escrita: o lock é obtido uma vez, logo no
+            # início (sem SQLITE_BUSY no meio), e há um único commit. A data lida
+            # antes entra no WHERE, então um pedido alterado pela API enquanto os
+            # JSONs eram lidos não é sobrescrito
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.executemany(
+                "UPDATE pedidos SET data_entrega = ? WHERE id = ? AND substr(data_entrega, 1, 10) = ?",
+                [(corr['json'], corr['id'], corr['db']) for corr in correcoes]
+            )
+        
         for corr in correcoes:
             print(f"ID {corr['id']}: {corr['db']} → {corr['json']}")
             
             if not dry_run:
-                cursor.execute(
-                    "UPDATE pedidos SET data_entrega = ? WHERE id = ?",
-                    (corr['json'], corr['id'])
-                )
                 print(f"  ✅ Corrigido!")
             else:
                 print(f"  ⏸️  (simulação - não foi alterado)")
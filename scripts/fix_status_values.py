@@ -3,11 +3,14 @@
 Script para corrigir valores de status no banco de dados.
 Normaliza todos os status para valores minúsculos conforme o schema.
 """
-import sqlite3
 from pathlib import Path
 import sys
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.db_utils import connect_sqlite
+
 DB_PATH = PROJECT_ROOT / "db" / "banco.db"
 
 # Mapeamento de status antigos para novos (minúsculos)
@@ -38,25 +41,27 @@ def fix_status_values(dry_run=True):
     print("=" * 80)
     print(f"Modo: {'SIMULAÇÃO (dry-run)' if dry_run else 'EXECUÇÃO REAL'}\n")
     
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_sqlite(DB_PATH)
     cursor = conn.cursor()
     
     try:
-        # Buscar todos os status únicos
-        cursor.execute("SELECT DISTINCT status FROM pedidos WHERE status IS NOT NULL")
-        status_values = [row[0] for row in cursor.fetchall()]
+        if not dry_run:
+            # Leitura e UPDATE na mesma transação de escrita: o lock é obtido uma
+            # vez, logo no início (sem SQLITE_BUSY no meio), e há um único commit
+            cursor.execute("BEGIN IMMEDIATE")
+        
+        # Status únicos e quantos pedidos têm cada um, em uma única agregação
+        cursor.execute("SELECT status, COUNT(*) FROM pedidos WHERE status IS NOT NULL GROUP BY status")
+        contagem = dict(cursor.fetchall())
+        status_values = list(contagem)
         
         print(f"📊 Status encontrados no banco: {status_values}\n")
         
         # Identificar quais precisam ser corrigidos
         correcoes = []
-        for status_antigo in status_values:
+        for status_antigo, count in contagem.items():
             status_novo = STATUS_MAP.get(status_antigo)
             if status_novo and status_novo != status_antigo:
-                # Contar quantos pedidos têm esse status
-                cursor.execute("SELECT COUNT(*) FROM pedidos WHERE status = ?", (status_antigo,))
-                count = cursor.fetchone()[0]
-                
                 correcoes.append({
                     'antigo': status_antigo,
                     'novo': status_novo,
@@ -64,8 +69,6 @@ def fix_status_values(dry_run=True):
                 })
             elif status_antigo not in STATUS_MAP.values():
                 # Status desconhecido - manter mas avisar
-                cursor.execute("SELECT COUNT(*) FROM pedidos WHERE status = ?", (status_antigo,))
-                count = cursor.fetchone()[0]
                 print(f"⚠️  Status desconhecido '{status_antigo}' encontrado em {count} pedido(s)")
                 print(f"   Não será alterado. Verifique se é válido.\n")
         
@@ -76,15 +79,22 @@ def fix_status_values(dry_run=True):
         print(f"📋 Encontradas {len(correcoes)} correções necessárias:\n")
         print("-" * 80)
         
+        if not dry_run:
+            # Um único UPDATE com CASE: a tabela é percorrida uma vez, não uma por status
+            case_sql = " ".join("WHEN ? THEN ?" for _ in correcoes)
+            placeholders = ",".join("?" * len(correcoes))
+            params = [value for corr in correcoes for value in (corr['antigo'], corr['novo'])]
+            params.extend(corr['antigo'] for corr in correcoes)
+            cursor.execute(
+                f"UPDATE pedidos SET status = CASE status {case_sql} END WHERE status IN ({placeholders})",
+                params
+            )
+        
         total_corrigidos = 0
         for corr in correcoes:
             print(f"{corr['antigo']} → {corr['novo']} ({corr['count']} pedido(s))")
             
             if not dry_run:
-                cursor.execute(
-                    "UPDATE pedidos SET status = ? WHERE status = ?",
-                    (corr['novo'], corr['antigo'])
-                )
                 total_corrigidos += corr['count']
                 print(f"  ✅ {corr['count']} pedido(s) atualizado(s)!")
             else:
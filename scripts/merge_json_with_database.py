@@ -5,16 +5,50 @@ Script para mesclar dados dos arquivos JSON com o banco de dados SQL.
 - Corrige datas de entrega incorretas baseado nos JSONs
 """
 import json
+import os
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import sys
 
+import orjson
+
 # Caminhos
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.db_utils import connect_sqlite
+
 MEDIA_PEDIDOS = PROJECT_ROOT / "media" / "pedidos"
 DB_PATH = PROJECT_ROOT / "db" / "banco.db"
 
+# Extração dos JSONs em processos: parse e normalização são CPU, não I/O.
+# No Windows o ProcessPoolExecutor aceita no máximo 61 workers
+JSON_EXTRACT_WORKERS = min(os.cpu_count() or 1, 61)
+JSON_EXTRACT_CHUNKSIZE = 64
+
+# Mapear valores comuns de status para os valores corretos do schema
+STATUS_MAP = {
+    'concluido': 'entregue',
+    'concluído': 'entregue',
+    'pendente': 'pendente',
+    'em producao': 'em_producao',
+    'em produção': 'em_producao',
+    'em_producao': 'em_producao',
+    'pronto': 'pronto',
+    'entregue': 'entregue',
+    'cancelado': 'cancelado',
+}
+
+VALID_PRIORIDADES = frozenset({'NORMAL', 'ALTA'})
+
+# Campos dos items que não são do banco
+ITEM_DROP_KEYS = frozenset({
+    'order_id', 'item_name', 'quantity', 'unit_price', 'subtotal',
+    'legenda_imagem', 'savedAt', 'savedBy', 'version',
+})
+
 def normalize_date(value):
     """Normaliza uma data para formato YYYY-MM-DD."""
     if not value:
@@ -28,8 +62,13 @@ def normalize_date(value):
 def extract_full_pedido_from_json(pedido_id, json_file):
     """Extrai todos os dados de um pedido de um arquivo JSON."""
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(json_file, 'rb') as f:
+            raw = f.read()
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # json aceita o que o orjson recusa (NaN, inteiros enormes)
+            data = json.loads(raw.decode('utf-8'))
         
         # Normalizar campos de data
         data_entrada = normalize_date(data.get('data_entrada'))
@@ -52,38 +91,27 @@ def extract_full_pedido_from_json(pedido_id, json_file):
         # Normalizar items
         items = data.get('items', [])
         # Remover campos que não são do banco dos items
-        items_clean = []
-        for item in items:
-            item_clean = {k: v for k, v in item.items() 
-                         if k not in ['order_id', 'item_name', 'quantity', 'unit_price', 'subtotal', 
-                                     'legenda_imagem', 'savedAt', 'savedBy', 'version']}
-            items_clean.append(item_clean)
+        items_clean = [
+            {k: v for k, v in item.items() if k not in ITEM_DROP_KEYS}
+            for item in items
+        ]
         
         # Converter items para JSON string
-        items_json = json.dumps(items_clean, ensure_ascii=False) if items_clean else '[]'
+        # Mesmo formato compacto que a API grava (items_to_json_string usa orjson)
+        try:
+            items_json = orjson.dumps(items_clean).decode('utf-8') if items_clean else '[]'
+        except orjson.JSONEncodeError:
+            items_json = json.dumps(items_clean, ensure_ascii=False)
         
         # Normalizar status - garantir valores minúsculos conforme schema
         status = data.get('status', 'pendente')
         status_lower = str(status).lower().strip()
         
-        # Mapear valores comuns para os valores corretos do schema
-        status_map = {
-            'concluido': 'entregue',
-            'concluído': 'entregue',
-            'pendente': 'pendente',
-            'em producao': 'em_producao',
-            'em produção': 'em_producao',
-            'em_producao': 'em_producao',
-            'pronto': 'pronto',
-            'entregue': 'entregue',
-            'cancelado': 'cancelado',
-        }
-        
-        status = status_map.get(status_lower, 'pendente')
+        status = STATUS_MAP.get(status_lower, 'pendente')
         
         # Normalizar prioridade
         prioridade = data.get('prioridade', 'NORMAL')
-        if prioridade not in ['NORMAL', 'ALTA']:
+        if not isinstance(prioridade, str) or prioridade not in VALID_PRIORIDADES:
             prioridade = 'NORMAL'
         
         # Normalizar forma_envio_id
@@ -164,135 +192,138 @@ def get_all_json_pedidos():
         print(f"❌ Diretório não encontrado: {MEDIA_PEDIDOS}")
         return {}
     
-    for pedido_dir in MEDIA_PEDIDOS.iterdir():
-        if not pedido_dir.is_dir() or pedido_dir.name == "tmp":
-            continue
+    # Primeiro só a listagem (leve, no processo principal): o JSON mais recente de cada pedido.
+    # scandir: tipo e mtime vêm das entradas da listagem (stat em cache), e o
+    # JSON mais recente sai de uma única passada, sem ordenar a lista
+    latest_jsons = []
+    with os.scandir(MEDIA_PEDIDOS) as pedido_dirs:
+        for pedido_dir in pedido_dirs:
+            if pedido_dir.name == "tmp" or not pedido_dir.is_dir():
+                continue
             
-        try:
-            pedido_id = int(pedido_dir.name)
-        except ValueError:
-            continue
-        
-        # Pegar o arquivo JSON mais recente de cada pedido
-        json_files = list(pedido_dir.glob("pedido-*.json"))
-        if not json_files:
-            continue
-        
-        # Ordenar por data de modificação (mais recente primeiro)
-        json_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-        latest_json = json_files[0]
-        
-        pedido_data = extract_full_pedido_from_json(pedido_id, latest_json)
-        if pedido_data:
-            pedidos_json[pedido_id] = pedido_data
+            try:
+                pedido_id = int(pedido_dir.name)
+            except ValueError:
+                continue
+            
+            latest_json = None
+            latest_mtime = None
+            with os.scandir(pedido_dir.path) as entries:
+                for entry in entries:
+                    if not (entry.name.startswith("pedido-") and entry.name.endswith(".json")):
+                        continue
+                    mtime = entry.stat().st_mtime
+                    if latest_mtime is None or mtime > latest_mtime:
+                        latest_json, latest_mtime = entry.path, mtime
+            if latest_json is not None:
+                latest_jsons.append((pedido_id, latest_json))
+    
+    # Cada arquivo é independente: a extração é distribuída entre os núcleos
+    # (sem arquivos, nem cria o pool). Os avisos de JSON inválido são impressos
+    # pelos workers, então podem sair intercalados no stdout
+    if latest_jsons:
+        with ProcessPoolExecutor(max_workers=JSON_EXTRACT_WORKERS) as executor:
+            extraidos = executor.map(
+                extract_full_pedido_from_json,
+                [pedido_id for pedido_id, _ in latest_jsons],
+                [path for _, path in latest_jsons],
+                chunksize=JSON_EXTRACT_CHUNKSIZE
+            )
+            for (pedido_id, _), pedido_data in zip(latest_jsons, extraidos):
+                if pedido_data:
+                    pedidos_json[pedido_id] = pedido_data
     
     print(f"✅ Encontrados {len(pedidos_json)} pedidos nos arquivos JSON\n")
     return pedidos_json
 
 def get_database_pedidos(conn):
-    """Busca todos os pedidos do banco de dados."""
-    cursor = conn.cursor()
+    """
+    Busca id e data_entrega de todos os pedidos do banco.
     
-    cursor.execute("""
-        SELECT 
-            id, numero, data_entrada, data_entrega, observacao, prioridade, status,
-            cliente, telefone_cliente, cidade_cliente, valor_total, valor_frete, valor_itens,
-            tipo_pagamento, obs_pagamento, forma_envio, forma_envio_id,
-            financeiro, conferencia, sublimacao, costura, expedicao, pronto,
-            sublimacao_maquina, sublimacao_data_impressao, items,
-            data_criacao, ultima_atualizacao
-        FROM pedidos
-        ORDER BY id
-    """)
-    
-    pedidos_db = {}
-    for row in cursor.fetchall():
-        pedido_id = row[0]
-        pedidos_db[pedido_id] = {
-            'id': row[0],
-            'numero': row[1],
-            'data_entrada': row[2],
-            'data_entrega': row[3],
-            'observacao': row[4],
-            'prioridade': row[5],
-            'status': row[6],
-            'cliente': row[7],
-            'telefone_cliente': row[8],
-            'cidade_cliente': row[9],
-            'valor_total': row[10],
-            'valor_frete': row[11],
-            'valor_itens': row[12],
-            'tipo_pagamento': row[13],
-            'obs_pagamento': row[14],
-            'forma_envio': row[15],
-            'forma_envio_id': row[16],
-            'financeiro': bool(row[17]) if row[17] is not None else False,
-            'conferencia': bool(row[18]) if row[18] is not None else False,
-            'sublimacao': bool(row[19]) if row[19] is not None else False,
-            'costura': bool(row[20]) if row[20] is not None else False,
-            'expedicao': bool(row[21]) if row[21] is not None else False,
-            'pronto': bool(row[22]) if row[22] is not None else False,
-            'sublimacao_maquina': row[23],
-            'sublimacao_data_impressao': row[24],
-            'items': row[25],
-            'data_criacao': row[26],
-            'ultima_atualizacao': row[27],
-        }
+    A mesclagem só compara data_entrega (e usa os ids para achar os faltantes),
+    então as demais colunas — inclusive o JSON de items — não são lidas.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, data_entrega FROM pedidos")
+    return {pedido_id: data_entrega for pedido_id, data_entrega in cursor}
+
+INSERT_PEDIDO_SQL = """
+    INSERT INTO pedidos (
+        id, numero, data_entrada, data_entrega, observacao, prioridade, status,
+        cliente, telefone_cliente, cidade_cliente, valor_total, valor_frete, valor_itens,
+        tipo_pagamento, obs_pagamento, forma_envio, forma_envio_id,
+        financeiro, conferencia, sublimacao, costura, expedicao, pronto,
+        sublimacao_maquina, sublimacao_data_impressao, items,
+        data_criacao, ultima_atualizacao
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_DATA_ENTREGA_SQL = """
+    UPDATE pedidos 
+    SET data_entrega = ?, ultima_atualizacao = ?
+    WHERE id = ?
+"""
+
+def _pedido_row(pedido_data):
+    """Monta a tupla de parâmetros de INSERT_PEDIDO_SQL para um pedido."""
+    # Garantir que data_entrada não seja None
+    if not pedido_data.get('data_entrada'):
+        pedido_data['data_entrada'] = datetime.utcnow().date().isoformat()
     
-    return pedidos_db
+    return (
+        pedido_data['id'],
+        pedido_data['numero'],
+        pedido_data['data_entrada'],
+        pedido_data.get('data_entrega'),
+        pedido_data.get('observacao', ''),
+        pedido_data.get('prioridade', 'NORMAL'),
+        pedido_data.get('status', 'pendente'),
+        pedido_data.get('cliente', ''),
+        pedido_data.get('telefone_cliente', ''),
+        pedido_data.get('cidade_cliente', ''),
+        pedido_data.get('valor_total', '0.00'),
+        pedido_data.get('valor_frete', '0.00'),
+        pedido_data.get('valor_itens', '0.00'),
+        pedido_data.get('tipo_pagamento', ''),
+        pedido_data.get('obs_pagamento', ''),
+        pedido_data.get('forma_envio', ''),
+        pedido_data.get('forma_envio_id', 0),
+        pedido_data.get('financeiro', False),
+        pedido_data.get('conferencia', False),
+        pedido_data.get('sublimacao', False),
+        pedido_data.get('costura', False),
+        pedido_data.get('expedicao', False),
+        pedido_data.get('pronto', False),
+        pedido_data.get('sublimacao_maquina'),
+        pedido_data.get('sublimacao_data_impressao'),
+        pedido_data.get('items', '[]'),
+        pedido_data.get('data_criacao', datetime.utcnow()),
+        pedido_data.get('ultima_atualizacao', datetime.utcnow()),
+    )
+
+def executemany_all_or_nothing(conn, sql, rows):
+    """
+    Executa todas as linhas com um único executemany dentro de um SAVEPOINT.
+    Se alguma linha falhar, desfaz o lote inteiro e retorna False para que o
+    chamador refaça linha a linha (com o diagnóstico de cada uma).
+    """
+    conn.execute("SAVEPOINT lote")
+    try:
+        conn.executemany(sql, rows)
+    except sqlite3.Error:
+        conn.execute("ROLLBACK TO lote")
+        conn.execute("RELEASE lote")
+        return False
+    conn.execute("RELEASE lote")
+    return True
 
 def insert_pedido(conn, pedido_data, dry_run=False):
     """Insere um pedido no banco de dados."""
     cursor = conn.cursor()
     
-    # Garantir que data_entrada não seja None
-    if not pedido_data.get('data_entrada'):
-        pedido_data['data_entrada'] = datetime.utcnow().date().isoformat()
-    
     try:
-        cursor.execute("""
-            INSERT INTO pedidos (
-                id, numero, data_entrada, data_entrega, observacao, prioridade, status,
-                cliente, telefone_cliente, cidade_cliente, valor_total, valor_frete, valor_itens,
-                tipo_pagamento, obs_pagamento, forma_envio, forma_envio_id,
-                financeiro, conferencia, sublimacao, costura, expedicao, pronto,
-                sublimacao_maquina, sublimacao_data_impressao, items,
-                data_criacao, ultima_atualizacao
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            pedido_data['id'],
-            pedido_data['numero'],
-            pedido_data['data_entrada'],
-            pedido_data.get('data_entrega'),
-            pedido_data.get('observacao', ''),
-            pedido_data.get('prioridade', 'NORMAL'),
-            pedido_data.get('status', 'pendente'),
-            pedido_data.get('cliente', ''),
-            pedido_data.get('telefone_cliente', ''),
-            pedido_data.get('cidade_cliente', ''),
-            pedido_data.get('valor_total', '0.00'),
-            pedido_data.get('valor_frete', '0.00'),
-            pedido_data.get('valor_itens', '0.00'),
-            pedido_data.get('tipo_pagamento', ''),
-            pedido_data.get('obs_pagamento', ''),
-            pedido_data.get('forma_envio', ''),
-            pedido_data.get('forma_envio_id', 0),
-            pedido_data.get('financeiro', False),
-            pedido_data.get('conferencia', False),
-            pedido_data.get('sublimacao', False),
-            pedido_data.get('costura', False),
-            pedido_data.get('expedicao', False),
-            pedido_data.get('pronto', False),
-            pedido_data.get('sublimacao_maquina'),
-            pedido_data.get('sublimacao_data_impressao'),
-            pedido_data.get('items', '[]'),
-            pedido_data.get('data_criacao', datetime.utcnow()),
-            pedido_data.get('ultima_atualizacao', datetime.utcnow()),
-        ))
-        
-        if not dry_run:
-            conn.commit()
-            return True
+        cursor.execute(INSERT_PEDIDO_SQL, _pedido_row(pedido_data))
+        # Sem commit por linha: merge_json_with_database confirma tudo de uma vez
         return True
     except sqlite3.IntegrityError as e:
         if 'UNIQUE' in str(e) or 'PRIMARY KEY' in str(e):
@@ -310,15 +341,7 @@ def update_pedido_data_entrega(conn, pedido_id, nova_data_entrega, dry_run=False
     cursor = conn.cursor()
     
     try:
-        cursor.execute("""
-            UPDATE pedidos 
-            SET data_entrega = ?, ultima_atualizacao = ?
-            WHERE id = ?
-        """, (nova_data_entrega, datetime.utcnow(), pedido_id))
-        
-        if not dry_run:
-            conn.commit()
-            return True
+        cursor.execute(UPDATE_DATA_ENTREGA_SQL, (nova_data_entrega, datetime.utcnow(), pedido_id))
         return True
     except Exception as e:
         print(f"  ❌ Erro ao atualizar pedido ID {pedido_id}: {e}")
@@ -345,10 +368,15 @@ def merge_json_with_database(dry_run=True):
         return
     
     # Conectar ao banco
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_sqlite(DB_PATH)
     conn.row_factory = sqlite3.Row
     
     try:
+        if not dry_run:
+            # Uma única transação de escrita para toda a mesclagem: um commit
+            # (um fsync) no final em vez de um por pedido importado/corrigido
+            conn.execute("BEGIN IMMEDIATE")
+        
         # Buscar pedidos do banco
         print("📊 Verificando pedidos no banco de dados...")
         pedidos_db = get_database_pedidos(conn)
@@ -374,8 +402,15 @@ def merge_json_with_database(dry_run=True):
             print(f"📥 IMPORTAÇÃO DE PEDIDOS FALTANTES ({len(apenas_json)} pedidos)")
             print("=" * 80)
             
+            ids_importacao = sorted(apenas_json)
+            # Todos os pedidos em um único executemany; só se algum falhar (ex.:
+            # numero duplicado) a importação é refeita pedido a pedido abaixo
+            importados_em_lote = not dry_run and executemany_all_or_nothing(
+                conn, INSERT_PEDIDO_SQL, [_pedido_row(pedidos_json[pedido_id]) for pedido_id in ids_importacao]
+            )
+            
             importados = 0
-            for pedido_id in sorted(apenas_json):
+            for pedido_id in ids_importacao:
                 pedido_data = pedidos_json[pedido_id]
                 
                 print(f"\n📦 Pedido ID {pedido_id}: {pedido_data.get('numero')} - {pedido_data.get('cliente')}")
@@ -384,7 +419,7 @@ def merge_json_with_database(dry_run=True):
                 print(f"   Status: {pedido_data.get('status')}")
                 
                 if not dry_run:
-                    if insert_pedido(conn, pedido_data, dry_run=False):
+                    if importados_em_lote or insert_pedido(conn, pedido_data, dry_run=False):
                         print(f"   ✅ Importado com sucesso!")
                         importados += 1
                     else:
@@ -406,10 +441,9 @@ def merge_json_with_database(dry_run=True):
         diferencas_data = []
         for pedido_id in em_ambos:
             pedido_json = pedidos_json[pedido_id]
-            pedido_db = pedidos_db[pedido_id]
             
             json_data = normalize_date(pedido_json.get('data_entrega'))
-            db_data = normalize_date(pedido_db.get('data_entrega'))
+            db_data = normalize_date(pedidos_db[pedido_id])
             
             if json_data and json_data != db_data:
                 diferencas_data.append({
@@ -424,6 +458,11 @@ def merge_json_with_database(dry_run=True):
             print(f"\n⚠️ Encontradas {len(diferencas_data)} datas de entrega que precisam ser corrigidas:\n")
             print("-" * 80)
             
+            agora = datetime.utcnow()
+            corrigidas_em_lote = not dry_run and executemany_all_or_nothing(
+                conn, UPDATE_DATA_ENTREGA_SQL, [(diff['json'], agora, diff['id']) for diff in diferencas_data]
+            )
+            
             corrigidas = 0
             for diff in diferencas_data:
                 print(f"ID {diff['id']} ({diff['numero']}) - {diff['cliente']}")
@@ -431,7 +470,7 @@ def merge_json_with_database(dry_run=True):
                 print(f"  JSON correto: {diff['json']}")
                 
                 if not dry_run:
-                    if update_pedido_data_entrega(conn, diff['id'], diff['json'], dry_run=False):
+                    if corrigidas_em_lote or update_pedido_data_entrega(conn, diff['id'], diff['json'], dry_run=False):
                         print(f"  ✅ Corrigido!")
                         corrigidas += 1
                     else:
@@ -453,6 +492,9 @@ def merge_json_with_database(dry_run=True):
         print("✅ MESCLAGEM CONCLUÍDA")
         print("=" * 80)
         
+        if not dry_run:
+            conn.commit()
+        
         if dry_run:
             print("\n⚠️  Modo simulação - nenhuma alteração foi feita")
             print("   Execute com --execute para aplicar as mudanças")
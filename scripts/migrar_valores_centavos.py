@@ -8,8 +8,10 @@ import csv
 import json
 import os
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
 from typing import Any, Optional, Tuple, List
 
+import orjson
 from sqlalchemy import create_engine, text
 
 
@@ -23,7 +25,13 @@ ONLY_INVALID = os.getenv("ONLY_INVALID", "0") == "1"
 def parse_money_decimal(value: Any) -> Optional[Decimal]:
     if value is None:
         return None
-    s = str(value).strip()
+    return _parse_money_str(str(value).strip())
+
+
+# Os mesmos valores ("0.00", "10,00", ...) se repetem em milhares de linhas;
+# a chave é o texto, então qualquer tipo de entrada (inclusive listas) é aceito
+@lru_cache(maxsize=4096)
+def _parse_money_str(s: str) -> Optional[Decimal]:
     if not s:
         return None
     s = s.replace("R$", "").replace("$", "").strip()
@@ -48,18 +56,29 @@ def to_centavos(dec: Decimal) -> int:
     return int((dec * Decimal("100")).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
 
 
+@lru_cache(maxsize=4096)
+def _centavos_candidates(s: str) -> Optional[Tuple[bool, int, int]]:
+    """(tem separador, valor lido como centavos, valor lido como reais) de um texto; None se inválido."""
+    dec = _parse_money_str(s)
+    if dec is None:
+        return None
+    return "," in s or "." in s, int(dec), to_centavos(dec)
+
+
 def infer_centavos(raw: Any, ref_centavos: Optional[int]) -> Tuple[Optional[int], str]:
-    if raw is None or str(raw).strip() == "":
+    if raw is None:
         return 0, "empty"
     s = str(raw).strip()
-    has_sep = "," in s or "." in s
-    dec = parse_money_decimal(s)
-    if dec is None:
+    if s == "":
+        return 0, "empty"
+    # Parse e arredondamento em Decimal só uma vez por texto distinto;
+    # por linha resta apenas a comparação com a referência
+    candidates = _centavos_candidates(s)
+    if candidates is None:
         return None, "invalid"
+    has_sep, as_centavos, as_reais = candidates
     if has_sep:
-        return to_centavos(dec), "sep_decimal"
-    as_centavos = int(dec)
-    as_reais = to_centavos(dec)
+        return as_reais, "sep_decimal"
     if not ref_centavos:
         return as_reais, "no_ref_assume_reais"
     if abs(as_centavos - ref_centavos) <= abs(as_reais - ref_centavos):
@@ -80,7 +99,13 @@ def _load_items(items_json: Any) -> List[dict]:
     if not items_json:
         return []
     try:
-        data = json.loads(items_json)
+        data = orjson.loads(items_json)
+    except orjson.JSONDecodeError:
+        # json aceita o que o orjson recusa (NaN, inteiros enormes)
+        try:
+            data = json.loads(items_json)
+        except Exception:
+            return []
     except Exception:
         return []
     return [item for item in data if isinstance(item, dict)]
@@ -135,6 +160,7 @@ def main() -> None:
         reason_counts: dict[str, int] = {}
         ambig_rows = 0
         invalid_rows = 0
+        updates: List[dict] = []
 
         for row in rows:
             pedido_id, vt, vf, vi, items_json = row
@@ -187,13 +213,17 @@ def main() -> None:
                 )
                 continue
 
+            updates.append({"vt": vt_cent, "vf": frete_cent, "vi": vi_cent, "id": pedido_id})
+
+        if updates:
+            # Uma lista de parâmetros: o driver faz executemany em vez de um execute por linha
             conn.execute(
                 text(
                     "UPDATE pedidos "
                     "SET valor_total_centavos=:vt, valor_frete_centavos=:vf, valor_itens_centavos=:vi "
                     "WHERE id=:id"
                 ),
-                {"vt": vt_cent, "vf": frete_cent, "vi": vi_cent, "id": pedido_id},
+                updates,
             )
 
         summary_rows = [
@@ -1,12 +1,12 @@
 import asyncio
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 import plotly.express as px
 import polars as pl
 import streamlit as st
-from sqlmodel import and_, func, or_, select
+from sqlmodel import and_, or_, select
 
 from database.database import async_session_maker
 from pedidos.schema import Pedido, Status
@@ -56,32 +56,24 @@ async def _load_pedidos(
         query = select(Pedido)
 
         if start and end:
-            start_value = start.strftime("%Y-%m-%d")
-            end_value = end.strftime("%Y-%m-%d")
+            # Intervalo semiaberto sobre a coluna crua (strings ISO): usa o índice,
+            # ao contrário de func.date(coluna), e inclui horários do último dia
+            start_value = start.isoformat()
+            end_value = (end + timedelta(days=1)).isoformat()
+            entrada_range = and_(
+                Pedido.data_entrada >= start_value,
+                Pedido.data_entrada < end_value,
+            )
+            entrega_range = and_(
+                Pedido.data_entrega >= start_value,
+                Pedido.data_entrega < end_value,
+            )
             if date_mode == "entrada":
-                query = query.where(
-                    func.date(Pedido.data_entrada) >= start_value,
-                    func.date(Pedido.data_entrada) <= end_value,
-                )
+                query = query.where(entrada_range)
             elif date_mode == "entrega":
-                query = query.where(
-                    Pedido.data_entrega.isnot(None),
-                    func.date(Pedido.data_entrega) >= start_value,
-                    func.date(Pedido.data_entrega) <= end_value,
-                )
+                query = query.where(Pedido.data_entrega.isnot(None), entrega_range)
             else:
-                query = query.where(
-                    or_(
-                        and_(
-                            func.date(Pedido.data_entrada) >= start_value,
-                            func.date(Pedido.data_entrada) <= end_value,
-                        ),
-                        and_(
-                            func.date(Pedido.data_entrega) >= start_value,
-                            func.date(Pedido.data_entrega) <= end_value,
-                        ),
-                    )
-                )
+                query = query.where(or_(entrada_range, entrega_range))
 
         if status_filter and status_filter != "Todos":
             status_map = {s.value: s for s in Status}
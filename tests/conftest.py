@@ -144,6 +144,14 @@ async def clean_db(test_session):
         await test_session.execute(text("PRAGMA foreign_keys = ON"))
         await test_session.commit()
     
+    # O DELETE direto não dispara os eventos do ORM: limpar relatórios em cache
+    from optimizations.cache import cache
+    from relatorios.fechamentos import relatorios_cache
+    from reposicoes.router import _detalhe_cache
+    cache.clear()
+    relatorios_cache.clear()
+    _detalhe_cache.clear()
+    
     yield test_session
 
 
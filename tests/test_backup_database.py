@@ -0,0 +1,54 @@
+import sqlite3
+from pathlib import Path
+
+import scripts.backup_before_deploy as backup_before_deploy_module
+from scripts.backup_database import sqlite_backup
+
+
+def _create_source_db(path: Path, rows: int = 3000) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE pedidos (id INTEGER PRIMARY KEY, cliente TEXT)")
+    conn.executemany(
+        "INSERT INTO pedidos (id, cliente) VALUES (?, ?)",
+        [(i, f"cliente {i}" * 20) for i in range(1, rows + 1)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_sqlite_backup_copia_banco_completo(tmp_path):
+    """
+    O backup deve terminar sem erro (inclusive o fsync final) e conter todas as linhas.
+    """
+    source = tmp_path / "banco.db"
+    _create_source_db(source)
+    destination = tmp_path / "backups" / "banco_backup.db"
+
+    sqlite_backup(source, destination)
+
+    conn = sqlite3.connect(destination)
+    try:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        assert conn.execute("SELECT COUNT(*) FROM pedidos").fetchone()[0] == 3000
+    finally:
+        conn.close()
+
+
+def test_backup_before_deploy_cria_backup(tmp_path, monkeypatch):
+    """
+    O backup pré-deploy deve retornar o caminho do arquivo criado, não None.
+    """
+    source = tmp_path / "banco.db"
+    _create_source_db(source, rows=10)
+    monkeypatch.setattr(backup_before_deploy_module, "resolve_sqlite_path", lambda: source)
+    monkeypatch.chdir(tmp_path)
+
+    backup_path = backup_before_deploy_module.backup_before_deploy()
+
+    assert backup_path is not None
+    conn = sqlite3.connect(tmp_path / backup_path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM pedidos").fetchone()[0] == 10
+    finally:
+        conn.close()
@@ -0,0 +1,100 @@
+"""
+Testes para o endpoint de relatório de envios.
+"""
+import pytest
+from httpx import AsyncClient
+
+import relatorios_envios.router
+
+
+async def _criar_pedidos(client: AsyncClient) -> None:
+    await client.post("/pedidos/", json={
+        "cliente": "Cliente 1",
+        "data_entrada": "2024-01-10",
+        "data_entrega": "2024-01-15",
+        "items": []
+    })
+    await client.post("/pedidos/", json={
+        "cliente": "Cliente 2",
+        "data_entrada": "2024-01-10",
+        "data_entrega": "2024-01-25",
+        "items": []
+    })
+
+
+@pytest.mark.asyncio
+async def test_relatorio_envios_filtra_por_data_entrega(client: AsyncClient, clean_db):
+    """Testa que o relatório filtra pela data de entrega."""
+    await _criar_pedidos(client)
+
+    response = await client.get(
+        "/relatorios-envios/pedidos?data_inicio=2024-01-14&data_fim=2024-01-16"
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    assert len(data) == 1
+    assert data[0]["cliente"] == "Cliente 1"
+
+
+@pytest.mark.asyncio
+async def test_relatorio_envios_stream_em_lotes(
+    client: AsyncClient, clean_db, monkeypatch
+):
+    """Testa que o streaming em lotes pequenos gera um array JSON válido."""
+    await _criar_pedidos(client)
+    await client.post("/pedidos/", json={
+        "cliente": "Cliente 3",
+        "data_entrada": "2024-01-10",
+        "data_entrega": "2024-01-20",
+        "items": []
+    })
+
+    original_iter = relatorios_envios.router.iter_pedidos
+
+    def iter_pequeno(*args, **kwargs):
+        return original_iter(*args, batch_size=1, **kwargs)
+
+    monkeypatch.setattr(relatorios_envios.router, "iter_pedidos", iter_pequeno)
+
+    response = await client.get("/relatorios-envios/pedidos")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+
+    assert len(data) == 3
+    assert {pedido["cliente"] for pedido in data} == {"Cliente 1", "Cliente 2", "Cliente 3"}
+
+
+@pytest.mark.asyncio
+async def test_relatorio_envios_erro_no_primeiro_lote_retorna_500(
+    client: AsyncClient, clean_db, monkeypatch
+):
+    """Testa que uma falha antes do primeiro pedido vira 500, não um 200 truncado."""
+
+    async def iter_com_erro(*args, **kwargs):
+        raise RuntimeError("banco indisponivel")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(relatorios_envios.router, "iter_pedidos", iter_com_erro)
+
+    response = await client.get("/relatorios-envios/pedidos")
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Erro interno ao gerar relatorio de envios"
+
+
+@pytest.mark.asyncio
+async def test_relatorio_envios_sem_resultados(client: AsyncClient, clean_db):
+    """Testa que um relatório vazio retorna um array vazio."""
+    response = await client.get("/relatorios-envios/pedidos")
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_relatorio_envios_periodo_invalido(client: AsyncClient, clean_db):
+    """Testa que datas invertidas retornam 400 antes do streaming."""
+    response = await client.get(
+        "/relatorios-envios/pedidos?data_inicio=2024-02-01&data_fim=2024-01-01"
+    )
+    assert response.status_code == 400
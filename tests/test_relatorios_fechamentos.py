@@ -0,0 +1,769 @@
+"""
+Testes para os endpoints de relatórios de fechamentos.
+Cobre o relatório analítico/sintético e a totalização de valores.
+"""
+import unicodedata
+from datetime import date
+
+import orjson
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from pedidos.schema import Pedido, Status
+from pedidos.service import json_string_to_items, json_strings_to_items
+from relatorios_fechamentos.router import (
+    _normalize_text,
+    _parse_order_date,
+    _parse_query_date,
+    _slugify,
+    _split_pedido_values,
+)
+
+
+def _items(*items: dict) -> str:
+    return orjson.dumps(list(items)).decode("utf-8")
+
+
+@pytest_asyncio.fixture
+async def pedidos_fechamento(clean_db, test_session):
+    """Cria pedidos com itens de designers/vendedores diferentes."""
+    pedidos = [
+        Pedido(
+            numero="0000001",
+            cliente="João Silva",
+            data_entrada="2024-03-01",
+            data_entrega="2024-03-05",
+            status=Status.PENDENTE,
+            forma_envio="Correios",
+            valor_frete="10.00",
+            valor_total="110.00",
+            items=_items(
+                {
+                    "descricao": "Painel A",
+                    "tipo_producao": "painel",
+                    "designer": "Ana",
+                    "vendedor": "Carlos",
+                    "valor_unitario": "60.00",
+                    "quantidade_paineis": "1",
+                },
+                {
+                    "descricao": "Lona B",
+                    "tipo_producao": "lona",
+                    "designer": "Bruno",
+                    "vendedor": "Carlos",
+                    "valor_unitario": "40.00",
+                    "quantidade_lona": "1",
+                },
+            ),
+        ),
+        Pedido(
+            numero="0000002",
+            cliente="Maria",
+            data_entrada="2024-03-02",
+            data_entrega="2024-03-10",
+            status=Status.ENTREGUE,
+            forma_envio="Retirada",
+            valor_frete="0",
+            valor_total="50.00",
+            items=_items(
+                {
+                    "descricao": "Totem C",
+                    "tipo_producao": "totem",
+                    "designer": "Ána",
+                    "vendedor": "Débora",
+                    "valor_unitario": "50.00",
+                    "quantidade_totem": "1",
+                },
+            ),
+        ),
+        Pedido(
+            numero="0000003",
+            cliente="Zeca",
+            data_entrada="2024-04-01",
+            data_entrega="2024-04-03",
+            status=Status.CANCELADO,
+            valor_frete="5.00",
+            valor_total="25.00",
+            items=_items(
+                {
+                    "descricao": "Adesivo D",
+                    "tipo_producao": "adesivo",
+                    "designer": "Bruno",
+                    "vendedor": "Carlos",
+                    "valor_unitario": "20.00",
+                    "quantidade_adesivo": "1",
+                },
+            ),
+        ),
+    ]
+    for pedido in pedidos:
+        test_session.add(pedido)
+    await test_session.commit()
+    return pedidos
+
+
+@pytest.mark.asyncio
+async def test_relatorio_sintetico_designer(client: AsyncClient, pedidos_fechamento):
+    """Testa agrupamento sintético por designer no período."""
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/relatorio",
+        params={
+            "report_type": "sintetico_designer",
+            "start_date": "2024-03-01",
+            "end_date": "2024-03-31",
+            "date_mode": "entrada",
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    labels = [group["label"] for group in data["groups"]]
+    # "Ána" cai no mesmo grupo de "Ana" (chave normalizada sem acento)
+    assert labels == ["Designer: Ana", "Designer: Bruno"]
+    ana = data["groups"][0]
+    assert ana["subtotal"] == {"valor_frete": 10.0, "valor_servico": 110.0}
+    assert ana["rows"][0]["ficha"] == "Pedidos: 2 · Itens: 2"
+    assert data["total"] == {"valor_frete": 10.0, "valor_servico": 150.0}
+    assert data["status_label"] == "Status: Todos"
+
+
+@pytest.mark.asyncio
+async def test_relatorio_analitico_designer_cliente(client: AsyncClient, pedidos_fechamento):
+    """Testa relatório analítico com subgrupos e linhas por item."""
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/relatorio",
+        params={
+            "report_type": "analitico_designer_cliente",
+            "start_date": "2024-03-01",
+            "end_date": "2024-03-31",
+            "date_mode": "entrada",
+            "frete_distribution": "proporcional",
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    bruno = next(g for g in data["groups"] if g["label"] == "Designer: Bruno")
+    assert [sub["label"] for sub in bruno["subgroups"]] == ["Cliente: João Silva"]
+    rows = bruno["subgroups"][0]["rows"]
+    assert rows == [
+        {"ficha": "0000001", "descricao": "Lona B", "valor_frete": 4.0, "valor_servico": 40.0}
+    ]
+    assert data["total"] == {"valor_frete": 10.0, "valor_servico": 150.0}
+
+
+@pytest.mark.asyncio
+async def test_relatorio_filtros_status_cliente_vendedor(client: AsyncClient, pedidos_fechamento):
+    """Testa filtros de status, cliente (sem acento) e vendedor."""
+    base_params = {
+        "report_type": "sintetico_cliente",
+        "start_date": "2024-03-01",
+        "end_date": "2024-04-30",
+        "date_mode": "entrada",
+    }
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/relatorio",
+        params={**base_params, "status": "cancelado"},
+    )
+    assert response.status_code == 200
+    assert [g["label"] for g in response.json()["groups"]] == ["Cliente: Zeca"]
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/relatorio",
+        params={**base_params, "cliente": "joao"},
+    )
+    assert [g["label"] for g in response.json()["groups"]] == ["Cliente: João Silva"]
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/relatorio",
+        params={**base_params, "vendedor": "debora"},
+    )
+    assert [g["label"] for g in response.json()["groups"]] == ["Cliente: Maria"]
+
+
+@pytest.mark.asyncio
+async def test_relatorio_status_invalido(client: AsyncClient, pedidos_fechamento):
+    """Testa que status desconhecido retorna 400."""
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/relatorio",
+        params={
+            "report_type": "sintetico_cliente",
+            "start_date": "2024-03-01",
+            "end_date": "2024-03-31",
+            "status": "xpto",
+        },
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_valor_total_pedidos(client: AsyncClient, pedidos_fechamento):
+    """Testa totalização de valor dos pedidos por período."""
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/valor-total",
+        params={"data_inicio": "2024-03-01", "data_fim": "2024-03-31"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_pedidos"] == 2
+    assert data["valor_total"] == 160.0
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/valor-total",
+        params={"data_inicio": "2024-03-01", "data_fim": "2024-04-30", "designer": "bruno"},
+    )
+    data = response.json()
+    assert data["total_pedidos"] == 2
+    assert data["valor_total"] == 135.0
+
+
+@pytest.mark.asyncio
+async def test_valor_total_pedidos_filtros_de_pedido(client: AsyncClient, pedidos_fechamento):
+    """Testa a soma no banco com filtros de status e cliente (sem filtro por item)."""
+    base_params = {"data_inicio": "2024-03-01", "data_fim": "2024-04-30"}
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/valor-total",
+        params={**base_params, "status": "entregue"},
+    )
+    data = response.json()
+    assert (data["total_pedidos"], data["valor_total"]) == (1, 50.0)
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/valor-total",
+        params={**base_params, "cliente": "silva"},
+    )
+    data = response.json()
+    assert (data["total_pedidos"], data["valor_total"]) == (1, 110.0)
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/valor-total",
+        params={**base_params, "date_mode": "entrega", "data_fim": "2024-03-31"},
+    )
+    data = response.json()
+    assert (data["total_pedidos"], data["valor_total"]) == (2, 160.0)
+
+
+@pytest.mark.asyncio
+async def test_valor_total_cache_invalidado_ao_gravar_pedido(
+    client: AsyncClient, pedidos_fechamento, test_session
+):
+    """Testa que o total em cache é descartado quando um pedido é gravado."""
+    params = {"data_inicio": "2024-03-01", "data_fim": "2024-03-31"}
+    response = await client.get("/relatorios-fechamentos/pedidos/valor-total", params=params)
+    assert response.json()["total_pedidos"] == 2
+
+    test_session.add(
+        Pedido(
+            numero="0000005",
+            cliente="Novo",
+            data_entrada="2024-03-20",
+            valor_total="20.00",
+            items=_items(),
+        )
+    )
+    await test_session.commit()
+
+    response = await client.get("/relatorios-fechamentos/pedidos/valor-total", params=params)
+    data = response.json()
+    assert (data["total_pedidos"], data["valor_total"]) == (3, 180.0)
+
+
+@pytest.mark.asyncio
+async def test_valor_total_cache_so_invalida_no_commit(
+    client: AsyncClient, pedidos_fechamento, test_session
+):
+    """Testa que o flush não descarta o cache: só o commit (dados já visíveis)."""
+    from relatorios.fechamentos import relatorios_cache
+
+    params = {"data_inicio": "2024-03-01", "data_fim": "2024-03-31"}
+    await client.get("/relatorios-fechamentos/pedidos/valor-total", params=params)
+    assert relatorios_cache.cache
+
+    test_session.add(
+        Pedido(
+            numero="0000006",
+            cliente="Novo",
+            data_entrada="2024-03-20",
+            valor_total="20.00",
+            items=_items(),
+        )
+    )
+    await test_session.flush()
+    assert relatorios_cache.cache
+
+    await test_session.commit()
+    assert not relatorios_cache.cache
+
+
+@pytest.mark.asyncio
+async def test_valor_total_pedidos_com_valor_legado(
+    client: AsyncClient, pedidos_fechamento, test_session
+):
+    """Testa que valores fora do formato "X.XX" continuam sendo somados."""
+    test_session.add(
+        Pedido(
+            numero="0000004",
+            cliente="Legado",
+            data_entrada="2024-03-15",
+            valor_total="R$ 1.000,50",
+            items=_items(),
+        )
+    )
+    test_session.add(
+        Pedido(
+            numero="0000005",
+            cliente="Sem Total",
+            data_entrada="2024-03-16",
+            valor_frete="5.00",
+            items=_items({"descricao": "Item", "valor_unitario": "20.00"}),
+        )
+    )
+    await test_session.commit()
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/valor-total",
+        params={"data_inicio": "2024-03-01", "data_fim": "2024-03-31"},
+    )
+    data = response.json()
+    assert data["total_pedidos"] == 4
+    assert data["valor_total"] == 1185.5
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("Designer: Ána", "designer-ana"),
+        ("Cliente: João  da Silva!!", "cliente-joao-da-silva"),
+        ("Vendedor/Designer: Sem vendedor / Zé", "vendedor-designer-sem-vendedor-ze"),
+        ("  --Data: 01/03/2024--  ", "data-01-03-2024"),
+        ("tipo_producao", "tipo-producao"),
+        ("", ""),
+    ],
+)
+def test_slugify(value, expected):
+    """Testa geração de slug com acentos, pontuação e separadores repetidos."""
+    assert _slugify(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("  Débora ", "debora"),
+        ("JOÃO", "joao"),
+        ("Carlos\t", "carlos"),
+        ("", ""),
+    ],
+)
+def test_normalize_text(value, expected):
+    """Testa normalização (sem acento, minúscula) com e sem caracteres não ASCII."""
+    assert _normalize_text(value) == expected
+
+
+@pytest.mark.parametrize(
+    "proporcional, expected_valores, expected_fretes",
+    [
+        (True, [60.0, 45.0], [6.0, 4.0]),
+        (False, [60.0, 45.0], [10.0, 10.0]),
+    ],
+)
+def test_split_pedido_values(proporcional, expected_valores, expected_fretes):
+    """Testa rateio do frete e ajuste do serviço no último item."""
+    valores, fretes = _split_pedido_values([60.0, 40.0], 10.0, 115.0, proporcional)
+    assert valores == expected_valores
+    assert fretes == pytest.approx(expected_fretes)
+
+
+def test_split_pedido_values_sem_valor_total():
+    """Testa que sem valor_total (ou serviço zerado) não há ajuste nem rateio."""
+    assert _split_pedido_values([0.0, 0.0], 5.0, 0.0, True) == ([0.0, 0.0], [0.0, 0.0])
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2024-03-01", date(2024, 3, 1)),
+        ("2024-3-1", date(2024, 3, 1)),
+        (None, None),
+    ],
+)
+def test_parse_query_date(value, expected):
+    """Testa o parse das datas de filtro, com e sem zero à esquerda."""
+    assert _parse_query_date(value, "start_date") == expected
+
+
+def test_parse_query_date_invalida():
+    """Testa que data de filtro inválida retorna 400."""
+    with pytest.raises(HTTPException) as exc_info:
+        _parse_query_date("01/03/2024", "start_date")
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "items_jsons",
+    [
+        [_items({"descricao": "A", "tipo_producao": "painel"}), None, "", "[]"],
+        [_items({"descricao": "A", "tipo_producao": "painel"}), "{quebrado", "null"],
+        ["[1],[2]", _items({"descricao": "B", "tipo_producao": "lona"})],
+    ],
+)
+def test_json_strings_to_items_equivale_ao_parse_individual(items_jsons):
+    """Testa que o parse em lote devolve o mesmo que o parse pedido a pedido."""
+    esperado = [json_string_to_items(items_json or "[]") for items_json in items_jsons]
+    assert json_strings_to_items(items_jsons) == esperado
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2024-03-01", date(2024, 3, 1)),
+        ("2024-03-31T18:30:00Z", date(2024, 3, 31)),
+        ("2024-3-1", date(2024, 3, 1)),
+        ("xpto", None),
+        ("", None),
+    ],
+)
+def test_parse_order_date(value, expected):
+    """Testa o parse das datas gravadas nos pedidos."""
+    assert _parse_order_date(value) == expected
+
+
+@pytest.mark.asyncio
+async def test_quantidade_pedidos_intervalo_inclui_dia_final(
+    client: AsyncClient, pedidos_fechamento, test_session
+):
+    """Testa que datas com horário no último dia entram no intervalo."""
+    test_session.add(
+        Pedido(
+            numero="0000006",
+            cliente="Com Horario",
+            data_entrada="2024-03-31T18:30:00",
+            items=_items(),
+        )
+    )
+    await test_session.commit()
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/quantidade",
+        params={"data_inicio": "2024-03-01", "data_fim": "2024-03-31"},
+    )
+    assert response.status_code == 200
+    assert response.json()["total"] == 3
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/quantidade",
+        params={"data_inicio": "2024-03-02", "data_fim": "2024-03-30"},
+    )
+    assert response.json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_relatorio_sem_periodo(client: AsyncClient, pedidos_fechamento):
+    """Testa o relatório sem start_date/end_date (todos os pedidos)."""
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/relatorio",
+        params={"report_type": "sintetico_cliente"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["groups"]) == 3
+    assert data["period_label"] == "Período não especificado"
+
+
+@pytest.mark.asyncio
+async def test_relatorio_sintetico_mistura_valores_canonicos_e_legados(
+    client: AsyncClient, pedidos_fechamento, test_session
+):
+    """Testa grupo que recebe pedidos com valores canônicos e em formato legado."""
+    test_session.add(
+        Pedido(
+            numero="0000007",
+            cliente="Maria",
+            data_entrada="2024-03-20",
+            valor_frete="2,00",
+            items=_items({"descricao": "Legado", "valor_unitario": "30.00"}),
+        )
+    )
+    await test_session.commit()
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/relatorio",
+        params={
+            "report_type": "sintetico_cliente",
+            "start_date": "2024-03-01",
+            "end_date": "2024-03-31",
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    maria = next(g for g in data["groups"] if g["label"] == "Cliente: Maria")
+    assert maria["rows"][0]["ficha"] == "Pedidos: 2 · Itens: 2"
+    assert maria["subtotal"] == {"valor_frete": 2.0, "valor_servico": 80.0}
+    assert data["total"] == {"valor_frete": 12.0, "valor_servico": 180.0}
+
+
+@pytest.mark.asyncio
+async def test_relatorio_sintetico_data_por_data_efetiva(client: AsyncClient, pedidos_fechamento):
+    """Testa sintético por data sem date_mode (usa data de entrega, senão entrada)."""
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/relatorio",
+        params={
+            "report_type": "sintetico_data",
+            "start_date": "2024-03-01",
+            "end_date": "2024-03-31",
+        },
+    )
+    assert response.status_code == 200
+    labels = [g["label"] for g in response.json()["groups"]]
+    assert labels == ["Data: 05/03/2024", "Data: 10/03/2024"]
+
+
+@pytest.mark.asyncio
+async def test_quantidade_filtro_cliente(client: AsyncClient, pedidos_fechamento):
+    """Testa o filtro parcial por cliente nas contagens."""
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/quantidade", params={"cliente": " SILVA "}
+    )
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/por-status", params={"cliente": "ma"}
+    )
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"status": "entregue", "total": 1}]
+
+
+@pytest.mark.asyncio
+async def test_dashboard_rankings(client: AsyncClient, pedidos_fechamento):
+    """Testa que o dashboard retorna os quatro rankings iguais aos endpoints individuais."""
+    params = {"data_inicio": "2024-03-01", "data_fim": "2024-04-30", "limit": 5}
+    response = await client.get("/relatorios-fechamentos/dashboard", params=params)
+    assert response.status_code == 200
+    data = response.json()
+
+    for category, path in [
+        ("por_cliente", "por-cliente"),
+        ("por_vendedor", "por-vendedor"),
+        ("por_designer", "por-designer"),
+        ("por_tipo_producao", "por-tipo-producao"),
+    ]:
+        individual = await client.get(f"/relatorios-fechamentos/pedidos/{path}", params=params)
+        assert data[category] == individual.json()["items"]
+
+    assert data["por_vendedor"][0] == {"name": "Carlos", "pedidos": 2, "items": 3.0, "revenue": 120.0}
+
+
+@pytest.mark.asyncio
+async def test_relatorio_semanal_intervalo(client: AsyncClient, pedidos_fechamento):
+    """Testa o relatório semanal por data de entrada e de entrega."""
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/relatorio-semanal",
+        params={"start_date": "2024-3-2", "end_date": "2024-03-10", "date_mode": "entrada"},
+    )
+    assert response.status_code == 200
+    assert [pedido["numero"] for pedido in response.json()] == ["0000002"]
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/relatorio-semanal",
+        params={"start_date": "2024-03-05", "end_date": "2024-03-10", "date_mode": "entrega"},
+    )
+    assert sorted(pedido["numero"] for pedido in response.json()) == ["0000001", "0000002"]
+
+
+@pytest.mark.asyncio
+async def test_resumo_pedidos(client: AsyncClient, pedidos_fechamento, test_session):
+    """Testa o resumo (total, por status e valor) com valor legado, igual ao /valor-total."""
+    test_session.add(
+        Pedido(
+            numero="0000008",
+            cliente="Legado",
+            data_entrada="2024-03-15",
+            status=Status.ENTREGUE,
+            valor_total="R$ 1.000,50",
+            items=_items(),
+        )
+    )
+    await test_session.commit()
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/resumo",
+        params={"data_inicio": "2024-03-01", "data_fim": "2024-03-31"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert data["valor_total"] == 1160.5
+    assert data["por_status"] == [
+        {"status": "entregue", "total": 2},
+        {"status": "pendente", "total": 1},
+    ]
+
+    por_status = await client.get(
+        "/relatorios-fechamentos/pedidos/por-status",
+        params={"data_inicio": "2024-03-01", "data_fim": "2024-03-31"},
+    )
+    assert por_status.json()["items"] == data["por_status"]
+
+    valor_total = await client.get(
+        "/relatorios-fechamentos/pedidos/valor-total",
+        params={"data_inicio": "2024-03-01", "data_fim": "2024-03-31"},
+    )
+    assert valor_total.json()["total_pedidos"] == data["total"]
+    assert valor_total.json()["valor_total"] == data["valor_total"]
+
+
+@pytest.mark.parametrize("frete_distribution", ["por_pedido", "proporcional"])
+@pytest.mark.asyncio
+async def test_relatorio_sintetico_por_pedido_igual_ao_calculo_por_item(
+    client: AsyncClient, clean_db, test_session, frete_distribution
+):
+    """
+    Testa que o sintético agrupado por pedido soma o mesmo que o analítico
+    (item a item) do mesmo cliente, com itens que não são objetos, pedido de
+    itens zerados (frete proporcional sem base) e ajuste menor que um centavo.
+    """
+    for numero, valor_frete, valor_total, items in (
+        ("0000011", "10.00", "40.00", [{"descricao": "Painel", "valor_unitario": "30.00"}, "solto", 7]),
+        ("0000012", "5.00", "15.00", [{"descricao": "Brinde", "valor_unitario": "0.00"}]),
+        ("0000013", "0.00", "100.01", [{"descricao": "Lona", "valor_unitario": "100.00"}]),
+    ):
+        test_session.add(
+            Pedido(
+                numero=numero,
+                cliente="Rui",
+                data_entrada="2024-03-15",
+                valor_frete=valor_frete,
+                valor_total=valor_total,
+                items=_items(*items),
+            )
+        )
+    await test_session.commit()
+
+    async def _grupo_rui(report_type: str) -> dict:
+        response = await client.get(
+            "/relatorios-fechamentos/pedidos/relatorio",
+            params={
+                "report_type": report_type,
+                "start_date": "2024-03-01",
+                "end_date": "2024-03-31",
+                "frete_distribution": frete_distribution,
+            },
+        )
+        assert response.status_code == 200
+        return next(g for g in response.json()["groups"] if g["label"] == "Cliente: Rui")
+
+    sintetico = await _grupo_rui("sintetico_cliente")
+    analitico = await _grupo_rui("analitico_cliente_designer")
+
+    assert sintetico["subtotal"] == analitico["subtotal"]
+    assert sintetico["rows"][0]["ficha"] == "Pedidos: 3 · Itens: 3"
+    assert sum(len(subgroup["rows"]) for subgroup in analitico["subgroups"]) == 3
+    # Ajuste de 0,01 não é absorvido; pedido zerado recebe o serviço pelo ajuste
+    assert sintetico["subtotal"]["valor_servico"] == 140.0
+    # Proporcional sem valor de serviço nos itens não rateia o frete
+    expected_frete = 15.0 if frete_distribution == "por_pedido" else 10.0
+    assert sintetico["subtotal"]["valor_frete"] == expected_frete
+
+
+@pytest.mark.parametrize(
+    "report_type,extra_params",
+    [
+        ("analitico_designer_painel", {}),
+        ("sintetico_vendedor_designer", {}),
+        ("analitico_designer_cliente", {"designer": "5"}),
+    ],
+)
+@pytest.mark.asyncio
+async def test_relatorio_itens_com_campos_texto_nao_string(
+    client: AsyncClient, clean_db, test_session, report_type, extra_params
+):
+    """Testa itens cujo JSON traz número/objeto/null em campos de texto: sem erro 500."""
+    test_session.add(
+        Pedido(
+            numero="0000021",
+            cliente="Rui",
+            data_entrada="2024-03-15",
+            valor_frete="0.00",
+            valor_total="40.00",
+            items=_items(
+                {
+                    "descricao": None,
+                    "tipo_producao": 3,
+                    "designer": 5,
+                    "vendedor": {"nome": "Carlos"},
+                    "valor_unitario": 20,
+                    "quantidade_paineis": 2,
+                },
+            ),
+        )
+    )
+    await test_session.commit()
+
+    response = await client.get(
+        "/relatorios-fechamentos/pedidos/relatorio",
+        params={
+            "report_type": report_type,
+            "start_date": "2024-03-01",
+            "end_date": "2024-03-31",
+            **extra_params,
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"]["valor_servico"] == 40.0
+    if report_type == "analitico_designer_painel":
+        group = data["groups"][0]
+        assert group["label"] == "Designer: 5"
+        assert group["subgroups"][0]["label"] == "Tipo de Produção: 3"
+        assert group["subgroups"][0]["rows"][0]["descricao"] == "3"
+
+
+@pytest.mark.parametrize("forma", ["NFC", "NFD"])
+@pytest.mark.asyncio
+async def test_relatorio_filtros_com_acentos_de_outros_idiomas(
+    client: AsyncClient, clean_db, test_session, forma
+):
+    """
+    Testa os filtros sem acento (cliente e designer, este pelos itens do
+    json_each) contra nomes com diacríticos fora do português, em NFC e NFD.
+    """
+    test_session.add(
+        Pedido(
+            numero="0000031",
+            cliente=unicodedata.normalize(forma, "Žofia Škoda"),
+            data_entrada="2024-03-15",
+            valor_frete="0.00",
+            valor_total="20.00",
+            items=_items(
+                {
+                    "descricao": "Painel",
+                    "designer": unicodedata.normalize(forma, "Šárka Dvořák"),
+                    "valor_unitario": "20.00",
+                }
+            ),
+        )
+    )
+    await test_session.commit()
+
+    for report_type, filtros in (
+        ("sintetico_cliente", {"cliente": "zofia"}),
+        ("sintetico_cliente", {"cliente": "fia sko"}),
+        ("analitico_designer_cliente", {"designer": "sarka"}),
+        ("analitico_designer_cliente", {"designer": "ka dvor"}),
+    ):
+        response = await client.get(
+            "/relatorios-fechamentos/pedidos/relatorio",
+            params={
+                "report_type": report_type,
+                "start_date": "2024-03-01",
+                "end_date": "2024-03-31",
+                **filtros,
+            },
+        )
+        assert response.status_code == 200
+        assert response.json()["total"]["valor_servico"] == 20.0
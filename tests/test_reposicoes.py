@@ -0,0 +1,128 @@
+"""
+Testes para os endpoints de reposições.
+"""
+import pytest
+from httpx import AsyncClient
+
+
+async def _criar_pedido(client: AsyncClient) -> int:
+    response = await client.post("/pedidos/", json={
+        "cliente": "Cliente Reposição",
+        "data_entrada": "2024-01-10",
+        "data_entrega": "2024-01-15",
+        "items": []
+    })
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_listar_reposicoes_filtros(client: AsyncClient, clean_db, admin_headers):
+    """Testa a listagem com filtros de pedido e status."""
+    pedido_id = await _criar_pedido(client)
+    for motivo, status_value in (("Cor errada", "Pendente"), ("Rasgo", "Concluída")):
+        response = await client.post(
+            "/reposicoes/",
+            json={"order_id": pedido_id, "motivo": motivo, "status": status_value},
+            headers=admin_headers,
+        )
+        assert response.status_code == 201
+
+    response = await client.get("/reposicoes/", headers=admin_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert {item["motivo"] for item in data} == {"Cor errada", "Rasgo"}
+    assert all(item["numero"] == f"REP-{item['id']}" for item in data)
+
+    response = await client.get(
+        "/reposicoes/", params={"order_id": pedido_id, "status": "Pendente"}, headers=admin_headers
+    )
+    data = response.json()
+    assert [item["motivo"] for item in data] == ["Cor errada"]
+    assert data[0]["order_id"] == pedido_id
+    assert data[0]["financeiro"] is False
+    assert data[0]["prioridade"] == "NORMAL"
+
+    response = await client.get("/reposicoes/", params={"status": "xpto"}, headers=admin_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_listar_reposicoes_paginado(client: AsyncClient, clean_db, admin_headers):
+    """Testa skip/limit na listagem (mais recentes primeiro)."""
+    pedido_id = await _criar_pedido(client)
+    for motivo in ("A", "B", "C"):
+        await client.post(
+            "/reposicoes/", json={"order_id": pedido_id, "motivo": motivo}, headers=admin_headers
+        )
+
+    response = await client.get("/reposicoes/", params={"limit": 2}, headers=admin_headers)
+    assert [item["motivo"] for item in response.json()] == ["C", "B"]
+
+    response = await client.get("/reposicoes/", params={"skip": 2, "limit": 2}, headers=admin_headers)
+    assert [item["motivo"] for item in response.json()] == ["A"]
+
+
+@pytest.mark.asyncio
+async def test_criar_reposicao_pedido_inexistente(client: AsyncClient, clean_db, admin_headers):
+    """Testa que criar reposição para pedido inexistente retorna 404."""
+    response = await client.post(
+        "/reposicoes/", json={"order_id": 9999, "motivo": "Rasgo"}, headers=admin_headers
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_obter_reposicao(client: AsyncClient, clean_db, admin_headers):
+    """Testa o detalhe de uma reposição e o 404 para id inexistente."""
+    pedido_id = await _criar_pedido(client)
+    response = await client.post(
+        "/reposicoes/",
+        json={"order_id": pedido_id, "motivo": "Cor errada", "data_entrega_prevista": "2024-02-01"},
+        headers=admin_headers,
+    )
+    criada = response.json()
+
+    response = await client.get(f"/reposicoes/{criada['id']}", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json() == criada
+
+    response = await client.get("/reposicoes/9999", headers=admin_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_atualizar_e_excluir_reposicao(client: AsyncClient, clean_db, admin_headers):
+    """Testa PATCH (incluindo pedido inexistente) e DELETE de uma reposição."""
+    pedido_id = await _criar_pedido(client)
+    response = await client.post(
+        "/reposicoes/", json={"order_id": pedido_id, "motivo": "Rasgo"}, headers=admin_headers
+    )
+    reposicao_id = response.json()["id"]
+    # Deixa o detalhe em cache antes do PATCH
+    response = await client.get(f"/reposicoes/{reposicao_id}", headers=admin_headers)
+    assert response.json()["status"] == "Pendente"
+
+    response = await client.patch(
+        f"/reposicoes/{reposicao_id}", json={"status": "Em Processamento", "costura": True}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["status"], data["costura"], data["motivo"]) == ("Em Processamento", True, "Rasgo")
+    response = await client.get(f"/reposicoes/{reposicao_id}", headers=admin_headers)
+    assert response.json()["status"] == "Em Processamento"
+
+    response = await client.patch(
+        f"/reposicoes/{reposicao_id}", json={"order_id": 9999}, headers=admin_headers
+    )
+    assert response.status_code == 404
+
+    response = await client.patch(
+        f"/reposicoes/{reposicao_id}", json={"prioridade": "URGENTE"}, headers=admin_headers
+    )
+    assert response.status_code == 400
+
+    response = await client.delete(f"/reposicoes/{reposicao_id}", headers=admin_headers)
+    assert response.status_code == 200
+    response = await client.get(f"/reposicoes/{reposicao_id}", headers=admin_headers)
+    assert response.status_code == 404